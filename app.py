@@ -503,7 +503,7 @@ else:
             random_seed=random_seed,
         )
 
-        total_stages = 1 + len(styles) + len(styles) * len(sizes)
+        total_stages = 2 + len(styles) * len(sizes)
 
         gen_state = {
             "cancel_event": threading.Event(),
@@ -0,0 +1,75 @@
+"""Batch CLI — run every combination of a job spec in one process or pool.
+
+Usage::
+
+    python batch.py jobs.toml [--jobs N] [--report report.json]
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import logging
+import signal
+import sys
+import threading
+from pathlib import Path
+
+from pipeline import PipelineCancelled
+from pipeline.batch import BatchSpec, run_batch
+
+logging.basicConfig(
+    level=logging.INFO,
+    format="%(asctime)s  %(levelname)-8s  %(name)s  %(message)s",
+    datefmt="%H:%M:%S",
+)
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="Run a batch of flashcard jobs.")
+    parser.add_argument("spec", type=Path, help="Job spec (.json or .toml).")
+    parser.add_argument("--jobs", type=int, default=None,
+                        help="Jobs to run in parallel (overrides the spec).")
+    parser.add_argument("--report", type=Path, default=None,
+                        help="Write per-job timings and throughput as JSON.")
+    args = parser.parse_args()
+
+    spec = BatchSpec.load(args.spec)
+    if args.jobs is not None:
+        spec.jobs = args.jobs
+
+    cancel_event = threading.Event()
+
+    def _sigint_handler(signum: int, frame: object) -> None:
+        print("\n\nCancelling… (waiting for running jobs to clean up)")
+        cancel_event.set()
+
+    signal.signal(signal.SIGINT, _sigint_handler)
+
+    try:
+        report = run_batch(
+            spec,
+            base_path=Path(__file__).resolve().parent,
+            cancelled=cancel_event.is_set,
+        )
+    except PipelineCancelled:
+        print("\nBatch cancelled.")
+        return 130
+
+    print(f"\n{'job':<45} {'PDFs':>4} {'seconds':>8}")
+    for job in report.jobs:
+        status = f"  FAILED: {job.error}" if job.error else ""
+        print(f"{job.label:<45} {len(job.pdfs):>4} {job.seconds:>8.1f}{status}")
+    print(
+        f"\n{report.decks} deck(s) in {report.seconds:.1f}s — "
+        f"{report.decks_per_minute:.1f} decks/min"
+    )
+
+    if args.report:
+        args.report.write_text(json.dumps(report.to_json(), indent=2))
+        print(f"Report written to {args.report}")
+    return 1 if report.failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,420 @@
+"""Benchmark every pipeline stage against synthetic asset packs.
+
+Each case runs in a fresh process, and its peak memory is measured from the
+end of its setup, so the figure covers the timed stage alone.  Results are
+written as JSON; pass an earlier result file to ``--compare`` to flag
+regressions between commits.
+
+Usage::
+
+    python benchmarks/bench.py --pack-sizes 10 100 1000 --out bench.json
+    python benchmarks/bench.py --cards 8 --compare bench.json
+
+Stage 1 always produces the same 55 problems; the pack size changes how many
+assets are discovered, pluralised and spread over those cards.
+"""
+
+from __future__ import annotations
+
+import argparse
+import dataclasses
+import itertools
+import json
+import logging
+import multiprocessing
+import platform
+import random
+import shutil
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import asdict, dataclass
+from pathlib import Path
+from typing import Any, Callable
+
+REPO_ROOT = Path(__file__).resolve().parent.parent
+if str(REPO_ROOT) not in sys.path:
+    sys.path.insert(0, str(REPO_ROOT))
+
+import PIL
+from PIL import Image, ImageDraw
+from reportlab.lib.pagesizes import A4
+from reportlab.pdfgen import canvas
+
+from pipeline import CardSize, Operation, PipelineConfig, Style
+from pipeline.card_creator import CardCreator
+from pipeline.manifest import is_back
+from pipeline.operations import generate_cards
+from pipeline.pdf_generator import _create_pdf_page, _preprocess_images, create_pdf
+from pipeline.pdf_settings import get_layout
+
+logger = logging.getLogger("benchmarks")
+
+SPRITE_PX = 1000
+
+
+# ---------------------------------------------------------------------------
+# Synthetic inputs
+# ---------------------------------------------------------------------------
+
+def make_pack(workdir: Path, count: int, sprite_px: int = SPRITE_PX) -> str:
+    """Create (or reuse) a pack of *count* random RGBA sprites; returns its name."""
+    name = f"Synthetic{count}"
+    pack_dir = workdir / "input" / "Assets" / name
+    if pack_dir.is_dir() and len(list(pack_dir.glob("*.png"))) == count:
+        return name
+
+    pack_dir.mkdir(parents=True, exist_ok=True)
+    rng = random.Random(count)
+    for i in range(count):
+        img = Image.new("RGBA", (sprite_px, sprite_px), (0, 0, 0, 0))
+        draw = ImageDraw.Draw(img)
+        for _ in range(3):
+            x0, y0 = rng.randrange(sprite_px // 2), rng.randrange(sprite_px // 2)
+            w, h = (rng.randrange(sprite_px // 4, sprite_px // 2) for _ in range(2))
+            x1, y1 = x0 + w, y0 + h
+            fill = tuple(rng.randrange(256) for _ in range(3)) + (255,)
+            draw.ellipse((x0, y0, x1, y1), fill=fill)
+        img.save(pack_dir / f"Sprite{i:04d}.png", "PNG")
+    logger.info("Created synthetic pack %s (%d sprites)", name, count)
+    return name
+
+
+def prepare_workdir(workdir: Path) -> None:
+    """Link the repo's templates and font into *workdir*'s ``input`` folder."""
+    inputs = workdir / "input"
+    (inputs / "Assets").mkdir(parents=True, exist_ok=True)
+    for rel in ("templates", "Assets/Quicksand-Bold.ttf"):
+        src, dst = REPO_ROOT / "input" / rel, inputs / rel
+        if dst.exists():
+            continue
+        try:
+            dst.symlink_to(src, target_is_directory=src.is_dir())
+        except OSError:
+            if src.is_dir():
+                shutil.copytree(src, dst)
+            else:
+                shutil.copy2(src, dst)
+
+
+# ---------------------------------------------------------------------------
+# Cases
+# ---------------------------------------------------------------------------
+
+@dataclass
+class Case:
+    """One benchmark: a pipeline function timed for a pack, style and size."""
+    name: str
+    pack_size: int
+    style: str | None = None
+    size: str | None = None
+
+
+@dataclass
+class Result:
+    name: str
+    pack_size: int
+    style: str | None
+    size: str | None
+    items: int
+    seconds: list[float]
+    median: float
+    per_item: float
+    # Peak RSS the timed runs added on top of the case's setup (Linux only).
+    peak_rss_bytes: int | None
+
+
+def _config(args: argparse.Namespace, case: Case, pack: str) -> PipelineConfig:
+    return PipelineConfig(
+        base_path=Path(args.workdir),
+        asset_pack=pack,
+        operation=Operation.ADDITION,
+        styles=[Style(case.style)] if case.style else [Style.STANDARD],
+        sizes=[CardSize(case.size)] if case.size else [CardSize.MEDIUM],
+        workers=args.workers,
+        print_scale=args.print_scale,
+        dpi=args.dpi,
+    )
+
+
+def _ensure_rendered(config: PipelineConfig, cards: list, size: CardSize) -> None:
+    """Render the Stage 2 PNGs a Stage 3 case reads, outside the timed region."""
+    folder, _ = get_layout(size, config, config.styles[0]).get_paths()
+    expected = 2 * len(cards)
+    if folder.is_dir() and len(list(folder.glob("*.png"))) >= expected:
+        return
+    creator = CardCreator(config, config.styles, size if config.print_scale else None)
+    creator.generate_all(cards)
+
+
+def _rss(field: str = "VmRSS") -> int | None:
+    """Current (or, with ``VmHWM``, peak) resident set size in bytes, if known."""
+    try:
+        status = Path("/proc/self/status").read_text()
+    except OSError:
+        return None
+    for line in status.splitlines():
+        if line.startswith(f"{field}:"):
+            return int(line.split()[1]) * 1024
+    return None
+
+
+def _reset_peak_rss() -> bool:
+    """Restart the kernel's peak-RSS counter at the current RSS (Linux only)."""
+    try:
+        Path("/proc/self/clear_refs").write_text("5")
+    except OSError:
+        return False
+    return True
+
+
+def _run_case(args: argparse.Namespace, case: Case) -> Result:
+    """Set up and time *case*; runs inside a fresh worker process."""
+    pack = make_pack(Path(args.workdir), case.pack_size, args.sprite_px)
+    config = _config(args, case, pack)
+    cards = generate_cards(config)[: args.cards]
+    style = config.styles[0]
+    size = config.sizes[0]
+    render_size = size if config.print_scale and case.size else None
+
+    # Each timed body returns the number of items it processed.
+    body: Callable[[], int]
+    if case.name == "generate_cards":
+        def body() -> int:
+            return len(generate_cards(config))
+
+    elif case.name in ("create_front", "create_back"):
+        creator = CardCreator(config, style, render_size)
+        render = getattr(creator, case.name)
+
+        def body() -> int:
+            for card in cards:
+                render(card).close()
+            return len(cards)
+
+    elif case.name == "generate_all":
+        creator = CardCreator(config, style, render_size)
+
+        def body() -> int:
+            creator.generate_all(cards)
+            return 2 * len(cards)
+
+    else:
+        _ensure_rendered(config, cards, size)
+        layout = get_layout(size, config, style)
+        folder, _ = layout.get_paths()
+
+        if case.name == "_preprocess_images":
+            def body() -> int:
+                images = _preprocess_images(folder, layout)
+                for img in images.values():
+                    img.close()
+                return len(images)
+
+        elif case.name == "_create_pdf_page":
+            images = _preprocess_images(folder, layout)
+            fronts = [(n, images[n]) for n in sorted(images) if not is_back(n)]
+            backs = [(n, images[n]) for n in sorted(images) if is_back(n)]
+            per_page = layout.CARDS_PER_PAGE
+
+            def body() -> int:
+                c = canvas.Canvas(str(Path(args.workdir) / "page.pdf"), pagesize=A4)
+                _create_pdf_page(c, layout.TEMPLATE_FRONT, fronts[:per_page], layout, *A4)
+                c.showPage()
+                _create_pdf_page(c, layout.TEMPLATE_BACK, backs[:per_page], layout, *A4, mirror=True)
+                c.showPage()
+                c.save()
+                return 2
+
+        elif case.name == "create_pdf":
+            def body() -> int:
+                create_pdf(config, style, size, cards)
+                return 2 * len(cards)
+
+        elif case.name == "create_pdf_edit":
+            # Incremental rebuild after one card changed: alternating between
+            # two decks that differ in their first card leaves one sheet dirty.
+            incremental = dataclasses.replace(config, incremental_pdf=True)
+            edited = [dataclasses.replace(cards[0], front_text=f"{cards[0].front_text} ")]
+            decks = itertools.cycle([edited + cards[1:], cards])
+            create_pdf(incremental, style, size, cards)
+
+            def body() -> int:
+                create_pdf(incremental, style, size, next(decks))
+                return 2
+
+        else:
+            raise ValueError(f"Unknown benchmark case: {case.name}")
+
+    # Everything above (pack, renders the case reads, imports) is setup; only
+    # memory the timed runs add on top of it counts.
+    baseline = _rss() if _reset_peak_rss() else None
+    seconds: list[float] = []
+    items = 0
+    for _ in range(args.repeat):
+        start = time.perf_counter()
+        items = body()
+        seconds.append(time.perf_counter() - start)
+    peak = _rss("VmHWM") if baseline is not None else None
+
+    median = statistics.median(seconds)
+    return Result(
+        name=case.name,
+        pack_size=case.pack_size,
+        style=case.style,
+        size=case.size,
+        items=items,
+        seconds=seconds,
+        median=median,
+        per_item=median / items if items else median,
+        peak_rss_bytes=peak - baseline if peak is not None and baseline is not None else None,
+    )
+
+
+def build_cases(args: argparse.Namespace) -> list[Case]:
+    """Every (function, pack, style, size) combination selected by *args*.
+
+    Stage 2 cases are size-independent unless cards render at print scale.
+    """
+    styles = [s.value for s in Style]
+    sizes = [s.value for s in CardSize]
+    render_sizes = sizes if args.print_scale else [None]
+
+    cases: list[Case] = []
+    for pack_size in args.pack_sizes:
+        cases.append(Case("generate_cards", pack_size))
+        for style in styles:
+            for name in ("create_front", "create_back", "generate_all"):
+                cases += [Case(name, pack_size, style, size) for size in render_sizes]
+            stage3 = ("_preprocess_images", "_create_pdf_page", "create_pdf", "create_pdf_edit")
+            for name in stage3:
+                cases += [Case(name, pack_size, style, size) for size in sizes]
+    if args.only:
+        cases = [c for c in cases if c.name in args.only]
+    return cases
+
+
+def run_isolated(args: argparse.Namespace, case: Case) -> Result:
+    ctx = multiprocessing.get_context("spawn")
+    with ProcessPoolExecutor(max_workers=1, mp_context=ctx) as pool:
+        return pool.submit(_run_case, args, case).result()
+
+
+# ---------------------------------------------------------------------------
+# Reporting
+# ---------------------------------------------------------------------------
+
+def _case_id(r: dict[str, Any]) -> tuple:
+    return r["name"], r["pack_size"], r["style"], r["size"]
+
+
+def _git_commit() -> str | None:
+    try:
+        out = subprocess.run(
+            ["git", "rev-parse", "HEAD"], cwd=REPO_ROOT,
+            capture_output=True, text=True, check=True,
+        )
+    except (OSError, subprocess.CalledProcessError):
+        return None
+    return out.stdout.strip()
+
+
+def compare(current: list[dict], baseline_path: Path, tolerance: float) -> list[str]:
+    """Return a line for every case whose median got slower than *tolerance* allows."""
+    baseline = json.loads(baseline_path.read_text())
+    before = {_case_id(r): r for r in baseline["results"]}
+    regressions = []
+    for r in current:
+        old = before.get(_case_id(r))
+        if old is None or not old["median"]:
+            continue
+        ratio = r["median"] / old["median"]
+        if ratio > 1 + tolerance:
+            regressions.append(
+                f"{' / '.join(str(p) for p in _case_id(r) if p is not None)}: "
+                f"{old['median']:.3f}s -> {r['median']:.3f}s ({ratio:.2f}x)"
+            )
+    return regressions
+
+
+def _format_row(r: dict[str, Any]) -> str:
+    rss = f"{r['peak_rss_bytes'] / 2**20:8.0f}" if r["peak_rss_bytes"] else "       -"
+    return (
+        f"{r['name']:<20} {r['pack_size']:>5} {r['style'] or '-':<13} {r['size'] or '-':<7}"
+        f" {r['median']:>9.3f} {r['per_item'] * 1000:>10.1f} {rss}"
+    )
+
+
+# ---------------------------------------------------------------------------
+# CLI
+# ---------------------------------------------------------------------------
+
+def parse_args(argv: list[str] | None = None) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--pack-sizes", type=int, nargs="+", default=[10, 100, 1000])
+    parser.add_argument("--cards", type=int, default=None,
+                        help="Limit Stage 2/3 cases to the first N cards.")
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--only", nargs="+", help="Run only these case names.")
+    parser.add_argument("--workers", type=int, default=1)
+    parser.add_argument("--print-scale", action="store_true")
+    parser.add_argument("--dpi", type=int, default=None)
+    parser.add_argument("--sprite-px", type=int, default=SPRITE_PX)
+    parser.add_argument("--workdir", type=Path, default=None,
+                        help="Keep synthetic packs and renders here between runs.")
+    parser.add_argument("--out", type=Path, default=None, help="Write JSON results here.")
+    parser.add_argument("--compare", type=Path, default=None,
+                        help="Earlier JSON results to check for regressions.")
+    parser.add_argument("--tolerance", type=float, default=0.15,
+                        help="Allowed slowdown of a median before it counts as a regression.")
+    return parser.parse_args(argv)
+
+
+def main(argv: list[str] | None = None) -> int:
+    logging.basicConfig(level=logging.INFO, format="%(message)s")
+    args = parse_args(argv)
+
+    keep_workdir = args.workdir is not None
+    args.workdir = str(args.workdir or tempfile.mkdtemp(prefix="fc-bench-"))
+    prepare_workdir(Path(args.workdir))
+
+    results: list[dict[str, Any]] = []
+    print(f"{'case':<20} {'pack':>5} {'style':<13} {'size':<7} {'median s':>9} {'ms/item':>10} {'+peak MB':>8}")
+    try:
+        for case in build_cases(args):
+            result = asdict(run_isolated(args, case))
+            results.append(result)
+            print(_format_row(result), flush=True)
+    finally:
+        if not keep_workdir:
+            shutil.rmtree(args.workdir, ignore_errors=True)
+
+    report = {
+        "meta": {
+            "commit": _git_commit(),
+            "timestamp": time.strftime("%Y-%m-%dT%H:%M:%S%z"),
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "pillow": PIL.__version__,
+            "args": {k: str(v) if isinstance(v, Path) else v for k, v in vars(args).items()},
+        },
+        "results": results,
+    }
+    if args.out:
+        args.out.write_text(json.dumps(report, indent=2))
+        logger.info("Results written to %s", args.out)
+
+    if args.compare:
+        regressions = compare(results, args.compare, args.tolerance)
+        for line in regressions:
+            logger.warning("REGRESSION %s", line)
+        if regressions:
+            return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,52 @@
+"""Asset pack compiler CLI — index a pack and pre-scale its sprites.
+
+Usage::
+
+    python compile_pack.py Animals [--sizes Medium Small] [--dpi 150] [--print-scale]
+
+Compile with the same sizes, DPI and print-scale setting the runs will use;
+sprite sizes not in the bundle are still resized from the PNGs.  Adding,
+removing or renaming an asset makes the index stale until recompiled.
+"""
+
+from __future__ import annotations
+
+import argparse
+import logging
+from pathlib import Path
+
+from pipeline import CardSize, Operation, PipelineConfig
+from pipeline.asset_pack import compile_pack
+
+logging.basicConfig(
+    level=logging.INFO,
+    format="%(asctime)s  %(levelname)-8s  %(name)s  %(message)s",
+    datefmt="%H:%M:%S",
+)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Compile asset packs.")
+    parser.add_argument("packs", nargs="+", help="Asset pack folder names under input/Assets.")
+    parser.add_argument("--sizes", nargs="+", type=CardSize, default=list(CardSize),
+                        help="Card sizes the runs use (default: all).")
+    parser.add_argument("--dpi", type=int, default=None,
+                        help="PDF resolution the runs use (default: the templates' own).")
+    parser.add_argument("--print-scale", action="store_true",
+                        help="Compile sprites at each size's print scale.")
+    args = parser.parse_args()
+
+    for pack in args.packs:
+        config = PipelineConfig(
+            base_path=Path(__file__).resolve().parent,
+            asset_pack=pack,
+            operation=Operation.ADDITION,
+            sizes=args.sizes,
+            dpi=args.dpi,
+            print_scale=args.print_scale,
+        )
+        print(f"Wrote {compile_pack(config)}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,50 @@
+"""Template compiler CLI — pre-decode templates into a memory-mapped bundle.
+
+Usage::
+
+    python compile_templates.py [--sizes Medium Small] [--dpi 150] [--print-scale]
+
+Compile with the same sizes, DPI and print-scale setting the runs will use;
+templates or scales not in the bundle are still decoded from their PNGs.
+"""
+
+from __future__ import annotations
+
+import argparse
+import logging
+from pathlib import Path
+
+from pipeline import CardSize, Operation, PipelineConfig
+from pipeline.template_bundle import compile_templates
+
+logging.basicConfig(
+    level=logging.INFO,
+    format="%(asctime)s  %(levelname)-8s  %(name)s  %(message)s",
+    datefmt="%H:%M:%S",
+)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Compile the card and page templates.")
+    parser.add_argument("--sizes", nargs="+", type=CardSize, default=list(CardSize),
+                        help="Card sizes to compile page templates for (default: all).")
+    parser.add_argument("--dpi", type=int, default=None,
+                        help="PDF resolution the runs use (default: the templates' own).")
+    parser.add_argument("--print-scale", action="store_true",
+                        help="Compile card templates at each size's print scale.")
+    args = parser.parse_args()
+
+    config = PipelineConfig(
+        base_path=Path(__file__).resolve().parent,
+        asset_pack="",
+        operation=Operation.ADDITION,
+        sizes=args.sizes,
+        dpi=args.dpi,
+        print_scale=args.print_scale,
+    )
+    for bundle in compile_templates(config):
+        print(f"Wrote {bundle}")
+
+
+if __name__ == "__main__":
+    main()
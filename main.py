@@ -7,7 +7,10 @@ import signal
 import threading
 from pathlib import Path
 
-from pipeline import CardSize, Operation, PipelineCancelled, PipelineConfig, Style, run_pipeline
+from pipeline import (
+    CardFormat, CardSize, Operation, PipelineCancelled, PipelineConfig, Style, Tracer,
+    run_pipeline,
+)
 
 logging.basicConfig(
     level=logging.INFO,
@@ -23,6 +26,19 @@ ASSET_PACK = "Animals"
 OPERATION = Operation.ADDITION
 STYLES = [Style.STANDARD, Style.COLOR_GRADED]
 SIZES = [CardSize.SMALL, CardSize.MEDIUM]
+WORKERS = 1
+SAVE_INTERMEDIATES = True
+CARD_FORMAT = CardFormat.PNG
+PNG_COMPRESS_LEVEL = 6
+PRINT_SCALE = False
+RENDER_CACHE = False
+INCREMENTAL_PDF = False
+PIPELINED = False
+VECTOR_TEXT = False
+VECTOR_SPRITES = False
+FLATTEN_CARDS = False
+DPI = None  # e.g. 150 (pipeline.pdf_settings.DRAFT_DPI) for quick proofs
+TRACE_FILE = None  # e.g. "trace.json" — open in chrome://tracing or ui.perfetto.dev
 
 # ====================================================
 
@@ -48,6 +64,18 @@ def main() -> None:
         operation=OPERATION,
         styles=STYLES,
         sizes=SIZES,
+        workers=WORKERS,
+        save_intermediates=SAVE_INTERMEDIATES,
+        card_format=CARD_FORMAT,
+        png_compress_level=PNG_COMPRESS_LEVEL,
+        print_scale=PRINT_SCALE,
+        dpi=DPI,
+        render_cache=RENDER_CACHE,
+        incremental_pdf=INCREMENTAL_PDF,
+        pipelined=PIPELINED,
+        vector_text=VECTOR_TEXT,
+        vector_sprites=VECTOR_SPRITES,
+        flatten_cards=FLATTEN_CARDS,
     )
 
     def on_stage(msg: str) -> None:
@@ -56,12 +84,15 @@ def main() -> None:
     def on_card(current: int, total: int, label: str) -> None:
         print(f"  Card {current}/{total} ({label})")
 
+    tracer = Tracer() if TRACE_FILE else None
+
     try:
         result = run_pipeline(
             config,
             on_stage=on_stage,
             on_card_progress=on_card,
             cancelled=cancel_event.is_set,
+            tracer=tracer,
         )
 
         print("\n==========================================")
@@ -79,6 +110,8 @@ def main() -> None:
 
     finally:
         signal.signal(signal.SIGINT, original_handler)
+        if tracer is not None:
+            tracer.save_chrome_trace(Path(TRACE_FILE))
 
 
 if __name__ == "__main__":
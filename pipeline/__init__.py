@@ -4,9 +4,12 @@ from __future__ import annotations
 
 import logging
 from pathlib import Path
-from typing import Callable
+from typing import Callable, Iterator
+
+from PIL import Image
 
 from pipeline.config import (
+    CardFormat,
     CardSize,
     Difficulty,
     FlashCard,
@@ -15,32 +18,79 @@ from pipeline.config import (
     PipelineConfig,
     Style,
     check_cancelled,
+    cleanup_files,
 )
 from pipeline.card_creator import CardCreator
+from pipeline.events import (
+    CardImage,
+    CardRendered,
+    EventCallback,
+    PageWritten,
+    PdfWritten,
+    PipelineEvent,
+    PipelineFinished,
+    StageStarted,
+)
+from pipeline.manifest import RunManifest
 from pipeline.operations import generate_cards, save_operations_file
-from pipeline.pdf_generator import create_pdf
+from pipeline.pdf_generator import create_pdf, iter_pdf, preprocess_image
+from pipeline.pdf_settings import get_layout
+from pipeline.pipelined import render_and_assemble
+from pipeline.resources import shared_cache
+from pipeline.tracing import Tracer, activate, span
 
 __all__ = [
+    "CardFormat",
     "CardSize",
     "Difficulty",
     "FlashCard",
     "Operation",
     "PipelineCancelled",
     "PipelineConfig",
+    "PipelineEvent",
     "Style",
+    "Tracer",
+    "iter_pipeline",
     "run_pipeline",
 ]
 
 logger = logging.getLogger(__name__)
 
 
-def _cleanup_files(files: list[Path]) -> None:
-    """Delete every file in *files* that still exists on disk."""
-    for f in files:
-        try:
-            f.unlink(missing_ok=True)
-        except OSError:
-            logger.warning("Could not delete %s", f)
+def _in_memory_sink(
+    config: PipelineConfig,
+    sizes: list[CardSize],
+    images: dict[Style, dict[CardSize, dict[str, Image.Image]]],
+) -> Callable[[Style, str, Image.Image], None]:
+    """Build a Stage 2 sink that preprocesses each card for *sizes* into *images*."""
+    layouts = {
+        style: {size: get_layout(size, config, style) for size in sizes}
+        for style in config.styles
+    }
+    for style in config.styles:
+        for size in sizes:
+            images.setdefault(style, {}).setdefault(size, {})
+
+    def sink(style: Style, name: str, img: Image.Image) -> None:
+        for size, layout in layouts[style].items():
+            images[style][size][name] = preprocess_image(name, img, layout)
+
+    return sink
+
+
+def _part_progress(
+    progress: Callable[[int, int, str], None] | None,
+    part: int,
+    parts: int,
+) -> Callable[[int, int, str], None] | None:
+    """Report card progress of one of *parts* render passes as a single count."""
+    if progress is None or parts == 1:
+        return progress
+
+    def _progress(current: int, total: int, label: str) -> None:
+        progress(part * total + current, parts * total, label)
+
+    return _progress
 
 
 def run_pipeline(
@@ -49,35 +99,97 @@ def run_pipeline(
     on_card_progress: Callable[[int, int, str], None] | None = None,
     on_pdf_progress: Callable[[str], None] | None = None,
     cancelled: Callable[[], bool] | None = None,
+    tracer: Tracer | None = None,
+    on_event: EventCallback = None,
 ) -> dict[str, list[Path]]:
-    """Run the full pipeline and return ``{"pdfs": [path, ...]}``."""
+    """Run the full pipeline and return ``{"pdfs": [path, ...]}``.
+
+    *on_event* receives a typed :mod:`pipeline.events` record for every
+    stage, rendered card, drawn sheet and written PDF, then a final
+    :class:`~pipeline.events.PipelineFinished`.
+
+    With ``config.pipelined``, or with ``config.save_intermediates`` off, PDF
+    sheets are drawn while cards are still rendering; PDF stage, page and
+    written-PDF callbacks then come from the assembler threads.
 
+    With a *tracer*, timed spans for every stage, card, page, resource load
+    and file write are recorded on it; export them with
+    :meth:`Tracer.save_json` or :meth:`Tracer.save_chrome_trace`.
+    """
+    args = (config, on_stage, on_card_progress, on_pdf_progress, cancelled, on_event)
+    if tracer is None:
+        return _run_pipeline(*args)
+    with activate(tracer), tracer.span("run_pipeline", "pipeline"):
+        return _run_pipeline(*args)
+
+
+def _run_pipeline(
+    config: PipelineConfig,
+    on_stage: Callable[[str], None] | None,
+    on_card_progress: Callable[[int, int, str], None] | None,
+    on_pdf_progress: Callable[[str], None] | None,
+    cancelled: Callable[[], bool] | None,
+    on_event: EventCallback,
+) -> dict[str, list[Path]]:
     created_files: list[Path] = []
 
+    def _emit(event: PipelineEvent) -> None:
+        if on_event:
+            on_event(event)
+
     def _stage(msg: str) -> None:
         logger.info(msg)
         if on_stage:
             on_stage(msg)
+        _emit(StageStarted(msg))
+
+    def _card(current: int, total: int, label: str) -> None:
+        if on_card_progress:
+            on_card_progress(current, total, label)
+        _emit(CardRendered(current, total, label))
+
+    shared_cache().resize(config.cache_max_bytes)
 
     try:
         # Stage 1 — Generate card data
         _stage("Generating math problems…")
-        cards = generate_cards(config)
+        with span("generate_cards", "stage"):
+            cards = generate_cards(config)
         check_cancelled(cancelled)
 
         # Write operations file for reference
         ops_path = config.ops_file_path()
         ops_path.parent.mkdir(parents=True, exist_ok=True)
-        save_operations_file(cards, ops_path)
+        with span("save_operations_file", "io"):
+            save_operations_file(cards, ops_path)
         created_files.append(ops_path)
 
-        # Stage 2 — Create card images for each style
-        for style in config.styles:
-            _stage(f"Creating {style.value} card images…")
-            creator = CardCreator(config, style)
-            files = creator.generate_all(
-                cards, progress=on_card_progress, cancelled=cancelled,
+        manifest = RunManifest.from_cards(cards, config.card_suffix)
+        # Cards kept in memory always go through the bounded per-PDF feeds, so
+        # a run never holds more of the deck than its sheets in flight.
+        if config.pipelined or not config.save_intermediates:
+            pdf_paths = _run_pipelined(
+                config, cards, manifest, created_files, _stage, _card,
+                on_pdf_progress, cancelled, _emit,
             )
+            _stage("Pipeline complete.")
+            _emit(PipelineFinished(pdf_paths))
+            return {"pdfs": pdf_paths}
+
+        # Stage 2 — Create card images for every style in one pass per card,
+        # so the style-independent layout is only computed once (once per
+        # size in print-scale mode).
+        labels = " + ".join(style.value for style in config.styles)
+        _stage(f"Creating {labels} card images…")
+        passes: list[CardSize | None] = list(config.sizes) if config.print_scale else [None]
+        for part, size in enumerate(passes):
+            creator = CardCreator(config, config.styles, size)
+            with span("render_cards", "stage", styles=labels, size=size and size.value):
+                files = creator.generate_all(
+                    cards,
+                    progress=_part_progress(_card, part, len(passes)),
+                    cancelled=cancelled,
+                )
             created_files.extend(files)
 
         # Stage 3 — Assemble PDFs
@@ -85,17 +197,139 @@ def run_pipeline(
         for style in config.styles:
             for size in config.sizes:
                 _stage(f"Assembling {size.value} {style.value} PDF…")
-                path = create_pdf(
-                    config, style, size, cards,
-                    progress=on_pdf_progress, cancelled=cancelled,
-                )
+                with span("create_pdf", "stage", style=style.value, size=size.value):
+                    path = create_pdf(
+                        config, style, size, cards,
+                        progress=on_pdf_progress, cancelled=cancelled,
+                        manifest=manifest,
+                        on_page=lambda done, total: _emit(PageWritten(style, size, done, total)),
+                    )
                 created_files.append(path)
                 pdf_paths.append(path)
+                _emit(PdfWritten(style, size, path))
 
         _stage("Pipeline complete.")
+        _emit(PipelineFinished(pdf_paths))
         return {"pdfs": pdf_paths}
 
     except PipelineCancelled:
         logger.info("Pipeline cancelled — cleaning up %d file(s).", len(created_files))
-        _cleanup_files(created_files)
+        cleanup_files(created_files)
+        raise
+
+
+def _run_pipelined(
+    config: PipelineConfig,
+    cards: list[FlashCard],
+    manifest: RunManifest,
+    created_files: list[Path],
+    stage: Callable[[str], None],
+    card_progress: Callable[[int, int, str], None],
+    on_pdf_progress: Callable[[str], None] | None,
+    cancelled: Callable[[], bool] | None,
+    emit: EventCallback,
+) -> list[Path]:
+    """Stages 2 and 3 overlapped: PDFs fill up while their cards render."""
+    labels = " + ".join(style.value for style in config.styles)
+    stage(f"Creating {labels} card images…")
+    passes = [[size] for size in config.sizes] if config.print_scale else [config.sizes]
+    written: dict[tuple[Style, CardSize], Path] = {}
+    for part, sizes in enumerate(passes):
+        creator = CardCreator(config, config.styles, sizes[0] if config.print_scale else None)
+        for style, size, path in render_and_assemble(
+            config, creator, cards, manifest, sizes, created_files,
+            on_stage=stage,
+            on_card_progress=_part_progress(card_progress, part, len(passes)),
+            on_pdf_progress=on_pdf_progress,
+            cancelled=cancelled,
+            on_event=emit,
+        ):
+            written[style, size] = path
+    return [written[style, size] for style in config.styles for size in config.sizes]
+
+
+def iter_pipeline(
+    config: PipelineConfig,
+    cancelled: Callable[[], bool] | None = None,
+) -> Iterator[PipelineEvent]:
+    """Run the pipeline, yielding every artifact as soon as it exists.
+
+    Yields a :class:`~pipeline.events.CardImage` per rendered card side, a
+    :class:`~pipeline.events.PageWritten` per sheet and a
+    :class:`~pipeline.events.PdfWritten` per finished PDF, with
+    :class:`~pipeline.events.StageStarted` markers in between and
+    :class:`~pipeline.events.PipelineFinished` last.
+
+    Unlike :func:`run_pipeline`, styles are rendered and assembled one at a
+    time, so the first PDF is ready after a single style's cards (a single
+    size's, at print scale) rather than after every card of every style.
+    If *cancelled* fires, partial files are removed and
+    :class:`PipelineCancelled` is raised; closing the iterator early keeps
+    whatever was already produced.
+    """
+    created_files: list[Path] = []
+
+    def _stage(msg: str) -> StageStarted:
+        logger.info(msg)
+        return StageStarted(msg)
+
+    shared_cache().resize(config.cache_max_bytes)
+
+    try:
+        yield _stage("Generating math problems…")
+        cards = generate_cards(config)
+        check_cancelled(cancelled)
+
+        ops_path = config.ops_file_path()
+        ops_path.parent.mkdir(parents=True, exist_ok=True)
+        save_operations_file(cards, ops_path)
+        created_files.append(ops_path)
+
+        manifest = RunManifest.from_cards(cards, config.card_suffix)
+        # Sizes served by each render pass: one pass per size at print scale.
+        passes = [[size] for size in config.sizes] if config.print_scale else [config.sizes]
+        pdf_paths: list[Path] = []
+        for style in config.styles:
+            for sizes in passes:
+                render_size = sizes[0] if config.print_scale else None
+                yield _stage(f"Creating {style.value} card images…")
+                in_memory: dict[Style, dict[CardSize, dict[str, Image.Image]]] | None = None
+                sink = None
+                if not config.save_intermediates:
+                    in_memory = {}
+                    sink = _in_memory_sink(config, sizes, in_memory)
+
+                creator = CardCreator(config, style, render_size)
+                rendered = creator.iter_render(cards, created_files, cancelled, keep_images=True)
+                for _card, images in rendered:
+                    for img_style, name, img in images:
+                        if sink is not None:
+                            sink(img_style, name, img)
+                        path = creator.output_dir / name if config.save_intermediates else None
+                        try:
+                            yield CardImage(img_style, render_size, name, img, path)
+                        finally:
+                            img.close()
+                created_files += creator.finish(cards)
+
+                for size in sizes:
+                    yield _stage(f"Assembling {size.value} {style.value} PDF…")
+                    path = yield from iter_pdf(
+                        config, style, size, cards,
+                        cancelled=cancelled,
+                        images=in_memory[style][size] if in_memory is not None else None,
+                        manifest=manifest,
+                    )
+                    created_files.append(path)
+                    pdf_paths.append(path)
+                    yield PdfWritten(style, size, path)
+                if in_memory is not None:
+                    in_memory.clear()
+
+        yield _stage("Pipeline complete.")
+        yield PipelineFinished(pdf_paths)
+
+    except PipelineCancelled:
+        logger.info("Pipeline cancelled — cleaning up %d file(s).", len(created_files))
+        cleanup_files(created_files)
         raise
@@ -0,0 +1,72 @@
+"""Asyncio front end — run the pipeline in an executor and stream its events."""
+
+from __future__ import annotations
+
+import asyncio
+import logging
+import threading
+from concurrent.futures import Executor
+from typing import AsyncIterator
+
+from pipeline import run_pipeline
+from pipeline.config import PipelineConfig
+from pipeline.events import PipelineEvent
+from pipeline.tracing import Tracer
+
+logger = logging.getLogger(__name__)
+
+
+async def run_pipeline_async(
+    config: PipelineConfig,
+    executor: Executor | None = None,
+    tracer: Tracer | None = None,
+) -> AsyncIterator[PipelineEvent]:
+    """Run the pipeline off the event loop, yielding its events as they happen.
+
+    The blocking work runs on *executor* (the loop's default thread pool if
+    None), so many jobs can share a bounded pool instead of each owning a
+    thread.  The last event is :class:`~pipeline.events.PipelineFinished`;
+    pipeline errors are raised from the iterator.
+
+    Cancelling the consuming task, or closing the iterator early, cancels
+    the run: the pipeline stops at its next check, cleans up its partial
+    files, and only then is the cancellation propagated.
+
+    Usage::
+
+        async for event in run_pipeline_async(config):
+            if isinstance(event, PdfWritten):
+                await upload(event.path)
+    """
+    loop = asyncio.get_running_loop()
+    # None marks the end of the run; it is queued after every event.
+    queue: asyncio.Queue[PipelineEvent | None] = asyncio.Queue()
+    cancel_event = threading.Event()
+
+    def _on_event(event: PipelineEvent) -> None:
+        loop.call_soon_threadsafe(queue.put_nowait, event)
+
+    def _run() -> None:
+        try:
+            run_pipeline(
+                config,
+                cancelled=cancel_event.is_set,
+                tracer=tracer,
+                on_event=_on_event,
+            )
+        finally:
+            loop.call_soon_threadsafe(queue.put_nowait, None)
+
+    future = loop.run_in_executor(executor, _run)
+    try:
+        while (event := await queue.get()) is not None:
+            yield event
+        await future
+    finally:
+        if not future.done():
+            cancel_event.set()
+            logger.info("Async pipeline run cancelled — waiting for cleanup.")
+            # Wait for the run to stop even if this task is cancelled again.
+            await asyncio.shield(asyncio.wait({future}))
+            if not future.cancelled():
+                future.exception()  # PipelineCancelled; mark it as retrieved
@@ -0,0 +1,84 @@
+"""Compile an asset pack: its metadata index plus every sprite size a run uses.
+
+A compiled pack is one bundle beside the pack folder (``Animals.pack`` for
+``Animals/``).  Its index holds each asset's plural, SHA-256, source size and
+alpha bounding box, so Stage 1 skips the folder scan and inflect; its pixels
+are the sprites pre-resized to every size the card layout can request, which
+``load_sprite`` maps instead of resizing.
+"""
+
+from __future__ import annotations
+
+import dataclasses
+import logging
+from functools import partial
+from pathlib import Path
+
+from PIL import Image
+
+from pipeline.card_creator import CardCreator
+from pipeline.config import PipelineConfig
+from pipeline.operations import get_asset_names, pluralize
+from pipeline.render_cache import file_digest
+from pipeline.resources import decode_sprite, pack_bundle_path
+from pipeline.template_bundle import BundleImage, write_bundle
+
+logger = logging.getLogger(__name__)
+
+
+def sprite_variants(config: PipelineConfig) -> set[tuple[int, int] | float]:
+    """Every sprite size and scale a run with *config* loads."""
+    # Only the scale matters here; keep the creators from making output dirs.
+    config = dataclasses.replace(config, save_intermediates=False)
+    sizes = config.sizes if config.print_scale else [None]
+    variants: set[tuple[int, int] | float] = set()
+    for size in sizes:
+        variants |= CardCreator(config, config.styles[0], size).sprite_variants()
+    return variants
+
+
+def compile_pack(config: PipelineConfig) -> Path:
+    """Write the compiled bundle of ``config.asset_pack`` and return its path."""
+    assets_dir = config.assets_dir
+    # Taken before reading, so a file added meanwhile makes the index stale.
+    mtime_ns = assets_dir.stat().st_mtime_ns
+    names = get_asset_names(assets_dir)
+    if not names:
+        raise FileNotFoundError(f"No assets found in {assets_dir}")
+    plurals = pluralize(names)
+    variants = sorted(sprite_variants(config), key=repr)
+
+    assets = {}
+    images = []
+    for name in names:
+        path = assets_dir / f"{name}.png"
+        with Image.open(path) as img:
+            mode, (w, h) = img.mode, img.size
+            bbox = img.convert("RGBA").getchannel("A").getbbox()
+        assets[name] = {
+            "plural": plurals[name],
+            "sha256": file_digest(path),
+            "width": w,
+            "height": h,
+            "bbox": bbox,
+        }
+        for variant in variants:
+            if isinstance(variant, tuple):
+                images.append(BundleImage(
+                    path, variant, mode, variant, partial(decode_sprite, path, size=variant),
+                ))
+            else:
+                images.append(BundleImage(
+                    path, variant, mode, (int(w * variant), int(h * variant)),
+                    partial(decode_sprite, path, scale=variant),
+                ))
+
+    logger.info(
+        "Compiling %d assets of %s at %d sprite size(s)…",
+        len(names), config.asset_pack, len(variants),
+    )
+    return write_bundle(
+        pack_bundle_path(assets_dir),
+        images,
+        {"pack": {"name": config.asset_pack, "mtime_ns": mtime_ns, "assets": assets}},
+    )
@@ -0,0 +1,293 @@
+"""Batch runs — every asset pack × operation × seed of a job spec in one go."""
+
+from __future__ import annotations
+
+import dataclasses
+import json
+import logging
+import multiprocessing
+import signal
+import time
+from concurrent.futures import FIRST_COMPLETED, Future, ProcessPoolExecutor, wait
+from dataclasses import dataclass, field
+from multiprocessing.synchronize import Event
+from pathlib import Path
+from typing import Any, Callable
+
+from pipeline import run_pipeline
+from pipeline.config import (
+    CardFormat,
+    CardSize,
+    Operation,
+    PipelineCancelled,
+    PipelineConfig,
+    Style,
+    check_cancelled,
+)
+from pipeline.resources import shared_cache
+
+logger = logging.getLogger(__name__)
+
+JobCallback = Callable[["JobResult"], None] | None
+
+# Spec keys that select jobs; everything else goes under ``options``.
+_MATRIX_KEYS = {"asset_packs", "operations", "seeds", "styles", "sizes", "jobs", "options"}
+_RESERVED_OPTIONS = {"base_path", "asset_pack", "operation", "styles", "sizes", "random_seed"}
+
+
+# ---------------------------------------------------------------------------
+# Job spec
+# ---------------------------------------------------------------------------
+
+@dataclass
+class BatchSpec:
+    """The job matrix: one pipeline run per asset pack × operation × seed.
+
+    Every run produces all *styles* × *sizes*.  ``jobs`` is the number of
+    runs executed in parallel, each in its own process; ``options`` are
+    passed through to :class:`PipelineConfig` (e.g. ``print_scale``).
+    """
+    asset_packs: list[str]
+    operations: list[Operation] = field(default_factory=lambda: list(Operation))
+    seeds: list[int] = field(default_factory=lambda: [234])
+    styles: list[Style] = field(default_factory=lambda: list(Style))
+    sizes: list[CardSize] = field(default_factory=lambda: list(CardSize))
+    jobs: int = 1
+    options: dict[str, Any] = field(default_factory=dict)
+
+    @classmethod
+    def from_dict(cls, data: dict[str, Any]) -> BatchSpec:
+        unknown = set(data) - _MATRIX_KEYS
+        if unknown:
+            raise ValueError(f"Unknown job spec key(s): {', '.join(sorted(unknown))}")
+        if not data.get("asset_packs"):
+            raise ValueError("Job spec needs at least one entry in 'asset_packs'.")
+
+        options = dict(data.get("options", {}))
+        allowed = {f.name for f in dataclasses.fields(PipelineConfig)} - _RESERVED_OPTIONS
+        bad = set(options) - allowed
+        if bad:
+            raise ValueError(f"Unknown pipeline option(s): {', '.join(sorted(bad))}")
+        if "gen_root" in options:
+            options["gen_root"] = Path(options["gen_root"])
+        if "card_format" in options:
+            options["card_format"] = CardFormat(options["card_format"])
+
+        spec = cls(asset_packs=list(data["asset_packs"]), options=options)
+        if "operations" in data:
+            spec.operations = [Operation(v) for v in data["operations"]]
+        if "seeds" in data:
+            spec.seeds = [int(v) for v in data["seeds"]]
+        if "styles" in data:
+            spec.styles = [Style(v) for v in data["styles"]]
+        if "sizes" in data:
+            spec.sizes = [CardSize(v) for v in data["sizes"]]
+        if "jobs" in data:
+            spec.jobs = int(data["jobs"])
+        return spec
+
+    @classmethod
+    def load(cls, path: Path) -> BatchSpec:
+        """Read a ``.json`` or ``.toml`` job spec."""
+        if path.suffix.lower() == ".toml":
+            try:
+                import tomllib
+            except ImportError:  # Python < 3.11
+                raise ValueError("TOML job specs need Python 3.11+; use JSON instead.")
+            data = tomllib.loads(path.read_text())
+        else:
+            data = json.loads(path.read_text())
+        return cls.from_dict(data)
+
+    def configs(self, base_path: Path) -> list[PipelineConfig]:
+        """One :class:`PipelineConfig` per job, in matrix order.
+
+        With several seeds each seed writes below ``Gen/seed-<n>`` so runs do
+        not overwrite each other.
+        """
+        gen_root = self.options.get("gen_root") or base_path / "Gen"
+        configs = []
+        for pack in self.asset_packs:
+            for operation in self.operations:
+                for seed in self.seeds:
+                    options = dict(self.options)
+                    if len(self.seeds) > 1:
+                        options["gen_root"] = gen_root / f"seed-{seed}"
+                    configs.append(PipelineConfig(
+                        base_path=base_path,
+                        asset_pack=pack,
+                        operation=operation,
+                        styles=list(self.styles),
+                        sizes=list(self.sizes),
+                        random_seed=seed,
+                        **options,
+                    ))
+        return configs
+
+
+# ---------------------------------------------------------------------------
+# Results
+# ---------------------------------------------------------------------------
+
+@dataclass
+class JobResult:
+    asset_pack: str
+    operation: str
+    seed: int
+    seconds: float
+    pdfs: list[str] = field(default_factory=list)
+    error: str | None = None
+    # Template/font/sprite lookups served warm vs loaded during this job.
+    cache_hits: int = 0
+    cache_misses: int = 0
+
+    @property
+    def label(self) -> str:
+        return f"{self.asset_pack} / {self.operation} / seed {self.seed}"
+
+
+@dataclass
+class BatchReport:
+    jobs: list[JobResult]
+    seconds: float
+
+    @property
+    def decks(self) -> int:
+        """Number of PDFs produced (one per pack × operation × seed × style × size)."""
+        return sum(len(job.pdfs) for job in self.jobs)
+
+    @property
+    def failed(self) -> list[JobResult]:
+        return [job for job in self.jobs if job.error is not None]
+
+    @property
+    def decks_per_minute(self) -> float:
+        return self.decks * 60 / self.seconds if self.seconds else 0.0
+
+    def to_json(self) -> dict[str, Any]:
+        return {
+            "seconds": self.seconds,
+            "decks": self.decks,
+            "decks_per_minute": self.decks_per_minute,
+            "jobs": [dataclasses.asdict(job) for job in self.jobs],
+        }
+
+
+# ---------------------------------------------------------------------------
+# Runner
+# ---------------------------------------------------------------------------
+
+def _run_job(
+    config: PipelineConfig,
+    cancelled: Callable[[], bool] | None = None,
+) -> JobResult:
+    """Run one pipeline job, recording a failure instead of raising it.
+
+    A cancelled job removes its partial output and raises
+    :class:`PipelineCancelled`.
+    """
+    start = time.perf_counter()
+    cache = shared_cache()
+    hits, misses = cache.hits, cache.misses
+    result = JobResult(config.asset_pack, config.operation.value, config.random_seed, 0.0)
+    try:
+        result.pdfs = [str(p) for p in run_pipeline(config, cancelled=cancelled)["pdfs"]]
+    except PipelineCancelled:
+        raise
+    except Exception as exc:
+        logger.exception("Batch job %s failed", result.label)
+        result.error = f"{type(exc).__name__}: {exc}"
+    result.seconds = time.perf_counter() - start
+    result.cache_hits = cache.hits - hits
+    result.cache_misses = cache.misses - misses
+    return result
+
+
+def run_batch(
+    spec: BatchSpec,
+    base_path: Path,
+    on_job: JobCallback = None,
+    cancelled: Callable[[], bool] | None = None,
+) -> BatchReport:
+    """Run every job of *spec* and return per-job timings and throughput.
+
+    Jobs run one after another in this process, or ``spec.jobs`` at a time
+    in a process pool.  Either way each process keeps its template, font and
+    sprite cache warm from one job to the next.  A failing job is reported
+    and the batch carries on; cancelling stops the running jobs, removes
+    their partial output and skips the rest.
+    """
+    configs = spec.configs(base_path)
+    start = time.perf_counter()
+    results: list[JobResult] = []
+
+    def _done(result: JobResult) -> None:
+        results.append(result)
+        logger.info(
+            "%s: %d PDF(s) in %.1fs (cache %d hit / %d miss)%s",
+            result.label, len(result.pdfs), result.seconds,
+            result.cache_hits, result.cache_misses,
+            f" — FAILED ({result.error})" if result.error else "",
+        )
+        if on_job:
+            on_job(result)
+
+    if spec.jobs <= 1 or len(configs) <= 1:
+        for config in configs:
+            check_cancelled(cancelled)
+            _done(_run_job(config, cancelled))
+    else:
+        _run_pool(configs, spec.jobs, _done, cancelled)
+
+    report = BatchReport(results, time.perf_counter() - start)
+    logger.info(
+        "Batch finished: %d job(s), %d deck(s) in %.1fs (%.1f decks/min), %d failed",
+        len(results), report.decks, report.seconds, report.decks_per_minute,
+        len(report.failed),
+    )
+    return report
+
+
+_worker_cancel: Event | None = None
+
+
+def _init_worker(cancel: Event) -> None:
+    """Leave Ctrl-C to the parent process; jobs stop once *cancel* is set."""
+    global _worker_cancel
+    signal.signal(signal.SIGINT, signal.SIG_IGN)
+    _worker_cancel = cancel
+
+
+def _run_job_in_worker(config: PipelineConfig) -> JobResult:
+    if _worker_cancel is None:
+        raise RuntimeError("Worker process was not initialised.")
+    return _run_job(config, _worker_cancel.is_set)
+
+
+def _run_pool(
+    configs: list[PipelineConfig],
+    jobs: int,
+    done: Callable[[JobResult], None],
+    cancelled: Callable[[], bool] | None,
+) -> None:
+    ctx = multiprocessing.get_context("spawn")
+    cancel = ctx.Event()
+    with ProcessPoolExecutor(
+        max_workers=min(jobs, len(configs)),
+        mp_context=ctx,
+        initializer=_init_worker,
+        initargs=(cancel,),
+    ) as pool:
+        pending: set[Future[JobResult]] = {pool.submit(_run_job_in_worker, c) for c in configs}
+        try:
+            while pending:
+                check_cancelled(cancelled)
+                finished, pending = wait(pending, timeout=0.2, return_when=FIRST_COMPLETED)
+                for fut in finished:
+                    done(fut.result())
+        except PipelineCancelled:
+            # Running jobs clean up after themselves before the pool shuts down.
+            cancel.set()
+            for fut in pending:
+                fut.cancel()
+            raise
@@ -3,18 +3,22 @@
 from __future__ import annotations
 
 import logging
+import multiprocessing
 import re
+from concurrent.futures import FIRST_COMPLETED, Future, ProcessPoolExecutor, wait
 from functools import lru_cache
+from dataclasses import dataclass
 from pathlib import Path
-from typing import Callable
+from typing import Callable, Iterator, Sequence
 
-from PIL import Image, ImageDraw, ImageFont
+from PIL import Image, ImageColor, ImageDraw, ImageFont
 
 from pipeline.config import (
     BOX_AREA_HEIGHT,
     BOX_AREA_WIDTH,
     BOTTOM_TEXT_BOX_HEIGHT,
     BOTTOM_TEXT_VERTICAL_OFFSET,
+    CardSize,
     Difficulty,
     FlashCard,
     FONT_SIZE_LARGE,
@@ -25,6 +29,7 @@ from pipeline.config import (
     IMAGE_VERTICAL_OFFSET,
     MAX_IMAGES_PER_ROW,
     Operation,
+    PipelineCancelled,
     PipelineConfig,
     Style,
     TEMPLATE_SIZE,
@@ -35,12 +40,27 @@ from pipeline.config import (
     VERTICAL_SHIFT_BOTTOM,
     VERTICAL_SHIFT_TOP,
     check_cancelled,
+    cleanup_files,
     text_color_for,
 )
+from pipeline.card_io import save_card
+from pipeline.manifest import RunManifest, back_name, front_name
+from pipeline.pdf_settings import get_layout
+from pipeline.render_cache import RenderCache, card_key
+from pipeline.resources import (
+    load_font,
+    load_sprite,
+    load_template,
+    load_trimmed_sprite,
+    load_trimmed_template,
+    shared_cache,
+)
+from pipeline.tracing import Span, Tracer, current_tracer, install, span
 
 logger = logging.getLogger(__name__)
 
 ProgressCallback = Callable[[int, int, str], None] | None
+ImageSink = Callable[[Style, str, Image.Image], None] | None
 
 # ---------------------------------------------------------------------------
 # Template / symbol path helpers
@@ -53,7 +73,7 @@ _DIFFICULTY_KEYS = {
 }
 
 
-def _template_paths(template_dir: Path) -> dict[str, dict[str, Path]]:
+def template_paths(template_dir: Path) -> dict[str, dict[str, Path]]:
     """Build lookup tables for all templates keyed by *type* then *difficulty*."""
     kinds: dict[str, dict[str, Path]] = {
         "front": {},
@@ -75,45 +95,170 @@ def _template_paths(template_dir: Path) -> dict[str, dict[str, Path]]:
     return kinds
 
 
+# ---------------------------------------------------------------------------
+# Layout plans
+# ---------------------------------------------------------------------------
+# Everything about a card that does not depend on the style — parsed numbers,
+# sprite grid, text measurement and rasterised glyphs — is computed once per
+# card and then applied to each style's template.
+
+@dataclass
+class _TextRun:
+    """One line of text rasterised once as an alpha mask.
+
+    *origin* is the left end of the baseline.  With ``config.vector_text``
+    there is no mask; the line is drawn into the PDF from *text* instead.
+    """
+    text: str
+    size: int
+    origin: tuple[int, int]
+    mask: Image.Image | None
+    box: tuple[int, int, int, int]
+
+    def shifted(self, dy: int) -> _TextRun:
+        x0, y0, x1, y1 = self.box
+        ox, oy = self.origin
+        return _TextRun(self.text, self.size, (ox, oy + dy), self.mask, (x0, y0 + dy, x1, y1 + dy))
+
+
+@dataclass(frozen=True)
+class CardText:
+    """One line of card text, for drawing as real text (``config.vector_text``).
+
+    Positions are card pixels at the creator's scale; (x, y) is the left end
+    of the baseline and *size* the font size in pixels.
+    """
+    text: str
+    x: int
+    y: int
+    size: int
+    color: tuple[int, int, int]
+
+
+@dataclass(frozen=True)
+class CardSprite:
+    """One placement of an asset sprite, for drawing in the PDF (``config.vector_sprites``).
+
+    The box is in card pixels at the creator's scale, (x, y) being its
+    top-left corner.
+    """
+    path: Path
+    x: int
+    y: int
+    w: int
+    h: int
+
+
+# Sprites are None when Stage 3 places them (vector_sprites).
+@dataclass
+class _FrontPlan:
+    symbol: str
+    sprite: Image.Image | None
+    positions: list[tuple[int, int]]
+    text: list[_TextRun]
+
+
+@dataclass
+class _BackPlan:
+    text: list[_TextRun]
+    operation: _TextRun
+    sprite: Image.Image | None
+    sprite_pos: tuple[int, int]
+
+
+def _text_run(
+    text: str,
+    font: ImageFont.FreeTypeFont,
+    xy: tuple[int, int],
+    raster: bool = True,
+) -> _TextRun:
+    """Rasterise *text* so it lands exactly where ``draw.text(xy, …)`` would."""
+    left, top, right, bottom = font.getbbox(text)
+    mask = None
+    if raster:
+        mask = Image.new("L", (max(right - left, 0), max(bottom - top, 0)), 0)
+        ImageDraw.Draw(mask).text((-left, -top), text, fill=255, font=font)
+    x, y = xy
+    origin = (x, y + font.getmetrics()[0])
+    return _TextRun(text, font.size, origin, mask, (x + left, y + top, x + right, y + bottom))
+
+
+def _draw_run(canvas: Image.Image, run: _TextRun, fill: str | tuple[int, int, int]) -> None:
+    if run.mask is not None and run.mask.width and run.mask.height:
+        canvas.paste(fill, run.box, run.mask)
+
+
 # ---------------------------------------------------------------------------
 # CardCreator
 # ---------------------------------------------------------------------------
 
 class CardCreator:
-    """Creates front and back flashcard PNGs for a given style."""
+    """Creates front and back flashcard images for one or more styles.
 
-    def __init__(self, config: PipelineConfig, style: Style) -> None:
-        self.config = config
-        self.style = style
-        self.output_dir = config.gen_dir(style)
-        self.output_dir.mkdir(parents=True, exist_ok=True)
+    Bulk generation renders every style in a single pass per card: the
+    style-independent layout is planned once and only the template and text
+    colour change between styles.  ``style`` is the first of ``styles`` and is
+    what :meth:`create_front` / :meth:`create_back` render.
 
-        self._templates = _template_paths(config.template_dir)
-        self._font_cache: dict[int, ImageFont.FreeTypeFont] = {}
-        self._asset_cache: dict[tuple[str, int, int], Image.Image] = {}
+    By default cards are composited at ``TEMPLATE_SIZE``.  Given a *size*,
+    every layout constant is scaled so the card comes out directly at the
+    pixel size that layout places on the page (see ``card_scale``).
+    """
+
+    def __init__(
+        self,
+        config: PipelineConfig,
+        style: Style | Sequence[Style],
+        size: CardSize | None = None,
+    ) -> None:
+        self.config = config
+        self.styles = [style] if isinstance(style, Style) else list(style)
+        self.style = self.styles[0]
+        self.size = size
+        self.scale = get_layout(size, config, self.style).card_scale if size else 1.0
+        self.output_dirs = {s: config.gen_dir(s, size) for s in self.styles}
+        self.output_dir = self.output_dirs[self.style]
+        if config.save_intermediates:
+            for d in self.output_dirs.values():
+                d.mkdir(parents=True, exist_ok=True)
+
+        self.label = " + ".join(s.value for s in self.styles)
+        # Text and sprites are left off the bitmaps when Stage 3 draws them.
+        self._raster_text = not config.vector_text
+        self._raster_sprites = not config.vector_sprites
+        self._templates = template_paths(config.template_dir)
+        self._render_cache = (
+            RenderCache(config.render_cache_dir, config) if config.render_cache else None
+        )
 
     # -- Caches ------------------------------------------------------------
+    # Templates, fonts and sprites live in the process-wide resource cache so
+    # they survive across CardCreator instances and pipeline runs.
 
     def _font(self, size: int) -> ImageFont.FreeTypeFont:
-        if size not in self._font_cache:
-            self._font_cache[size] = ImageFont.truetype(
-                str(self.config.font_path), size=size,
-            )
-        return self._font_cache[size]
+        return load_font(self.config.font_path, self._px(size))
 
-    def _asset_image(self, name: str, size: tuple[int, int]) -> Image.Image:
-        key = (name, *size)
-        if key not in self._asset_cache:
-            path = self.config.assets_dir / f"{name}.png"
-            self._asset_cache[key] = Image.open(path).resize(size)
-        return self._asset_cache[key]
+    def _asset_path(self, name: str) -> Path:
+        return self.config.assets_dir / f"{name}.png"
 
-    def _open_template(self, kind: str, difficulty: str) -> Image.Image:
-        path = self._templates[kind].get(difficulty, self._templates[kind]["standard"])
-        return Image.open(path).convert("RGBA")
+    def _template_path(self, kind: str, difficulty: str) -> Path:
+        return self._templates[kind].get(difficulty, self._templates[kind]["standard"])
+
+    def _open_template(self, kind: str, difficulty: str, copy: bool = True) -> Image.Image:
+        return load_template(
+            self._template_path(kind, difficulty), scale=self.scale, copy=copy,
+        )
+
+    @staticmethod
+    def _diff_key(card: FlashCard, style: Style) -> str:
+        return "standard" if style is Style.STANDARD else card.difficulty
 
     # -- Geometry helpers --------------------------------------------------
 
+    def _px(self, value: float) -> int:
+        """Convert a full-resolution length to pixels at the render scale."""
+        return round(value * self.scale)
+
     @staticmethod
     def _row_positions(
         count: int,
@@ -153,13 +298,24 @@ class CardCreator:
 
     # -- Front card --------------------------------------------------------
 
-    def _place_images(
+    @staticmethod
+    def _sprite_side(num_top: int, num_bottom: int) -> int:
+        """Full-resolution side length of the front sprites."""
+        if num_top < 5 and num_bottom < 5:
+            return min(BOX_AREA_WIDTH // max(num_top, num_bottom), BOX_AREA_HEIGHT)
+        return BOX_AREA_WIDTH // MAX_IMAGES_PER_ROW
+
+    def sprite_variants(self) -> set[tuple[int, int] | float]:
+        """Every ``load_sprite`` size (fronts) and scale (backs) this creator uses."""
+        sides = {self._sprite_side(n, n) for n in range(1, 11)}
+        return {(self._px(s), self._px(s)) for s in sides} | {IMAGE_SCALE_FACTOR * self.scale}
+
+    def _sprite_grid(
         self,
-        canvas: Image.Image,
         num_top: int,
         num_bottom: int,
-        asset_name: str,
-    ) -> None:
+    ) -> tuple[int, list[tuple[int, int]]]:
+        """Side length and positions of the front sprites."""
         top_y = FRAME_TOP_Y + VERTICAL_SHIFT_TOP
         bot_y = FRAME_BOTTOM_Y + VERTICAL_SHIFT_BOTTOM - BOX_AREA_HEIGHT
         cx = (TEMPLATE_SIZE[0] - BOX_AREA_WIDTH) // 2
@@ -167,66 +323,88 @@ class CardCreator:
         top_box = (BOX_AREA_WIDTH, BOX_AREA_HEIGHT, cx, top_y)
         bot_box = (BOX_AREA_WIDTH, BOX_AREA_HEIGHT, cx, bot_y)
 
-        if num_top < 5 and num_bottom < 5:
-            side = BOX_AREA_WIDTH // max(num_top, num_bottom)
-            if side > BOX_AREA_HEIGHT:
-                side = BOX_AREA_HEIGHT
-            img_size = (side, side)
-        else:
-            side = BOX_AREA_WIDTH // MAX_IMAGES_PER_ROW
-            img_size = (side, side)
-
-        img = self._asset_image(asset_name, img_size)
+        side = self._sprite_side(num_top, num_bottom)
+        img_size = (side, side)
 
-        for pos in self._grid_positions(num_top, top_box, img_size):
-            canvas.paste(img, pos, img)
-        for pos in self._grid_positions(num_bottom, bot_box, img_size):
-            canvas.paste(img, pos, img)
+        positions = [
+            (self._px(x), self._px(y))
+            for x, y in (
+                self._grid_positions(num_top, top_box, img_size)
+                + self._grid_positions(num_bottom, bot_box, img_size)
+            )
+        ]
+        return self._px(side), positions
 
-    def _draw_front_text(self, canvas: Image.Image, text: str) -> None:
-        draw = ImageDraw.Draw(canvas)
+    def _front_text(self, text: str) -> list[_TextRun]:
         font = self._font(FONT_SIZE_LARGE)
-        box_x = (TEMPLATE_SIZE[0] - TEXT_BOX_WIDTH) // 2
-        box_y = TEMPLATE_SIZE[1] - TEXT_BOX_HEIGHT - 170
+        box_x = self._px((TEMPLATE_SIZE[0] - TEXT_BOX_WIDTH) // 2)
+        box_y = self._px(TEMPLATE_SIZE[1] - TEXT_BOX_HEIGHT - 170)
+        box_w = self._px(TEXT_BOX_WIDTH)
 
         words = text.split()
         row1 = " ".join(words[:3])
         row2 = " ".join(words[3:])
 
+        runs = []
         for i, line in enumerate([row1, row2]):
-            tw, th = draw.textbbox((0, 0), line, font=font)[2:]
-            x = box_x + (TEXT_BOX_WIDTH - tw) // 2
-            y = box_y + i * TEXT_BOX_HEIGHT // 2 + (TEXT_BOX_HEIGHT // 4 - th // 2)
-            draw.text((x, y), line, fill=(255, 255, 255), font=font)
-
-    def create_front(self, card: FlashCard) -> Image.Image:
-        diff_key = "standard" if self.style is Style.STANDARD else card.difficulty
-        fc = self._open_template("front", diff_key)
+            tw, th = font.getbbox(line)[2:]
+            x = box_x + (box_w - tw) // 2
+            y = (
+                box_y
+                + self._px(i * TEXT_BOX_HEIGHT // 2)
+                + (self._px(TEXT_BOX_HEIGHT // 4) - th // 2)
+            )
+            runs.append(_text_run(line, font, (x, y), self._raster_text))
+        return runs
 
+    @staticmethod
+    def _operands(card: FlashCard) -> tuple[int, str, int]:
         match = re.match(r"(\d+)\s*([+\-])\s*(\d+)\s*=\s*\d+", card.operation_text)
         if not match:
             raise ValueError(f"Bad operation format: {card.operation_text}")
-        num_top, symbol, num_bottom = int(match[1]), match[2], int(match[3])
+        return int(match[1]), match[2], int(match[3])
+
+    def _plan_front(self, card: FlashCard) -> _FrontPlan:
+        num_top, symbol, num_bottom = self._operands(card)
+        side, positions = self._sprite_grid(num_top, num_bottom)
+        sprite = None
+        if self._raster_sprites:
+            # Pasting the opaque crop at its offset gives the same pixels.
+            sprite, (dx, dy) = load_trimmed_sprite(
+                self._asset_path(card.asset_name), size=(side, side),
+            )
+            positions = [(x + dx, y + dy) for x, y in positions]
+        return _FrontPlan(
+            symbol="plus" if symbol == "+" else "minus",
+            sprite=sprite,
+            positions=positions,
+            text=self._front_text(card.front_text),
+        )
+
+    def _compose_front(self, card: FlashCard, style: Style, plan: _FrontPlan) -> Image.Image:
+        diff_key = self._diff_key(card, style)
+        fc = self._open_template("front", diff_key)
 
-        self._place_images(fc, num_top, num_bottom, card.asset_name)
-        self._draw_front_text(fc, card.front_text)
+        if plan.sprite is not None:
+            for pos in plan.positions:
+                fc.paste(plan.sprite, pos, plan.sprite)
+        for run in plan.text:
+            _draw_run(fc, run, self._text_fill(card, "front", style))
 
-        sym_kind = "plus" if symbol == "+" else "minus"
-        sym = self._open_template(sym_kind, diff_key)
-        fc.paste(sym, (0, 0), sym)
+        # The symbol overlay is card-sized but almost all transparent.
+        sym, offset = load_trimmed_template(self._template_path(plan.symbol, diff_key), self.scale)
+        fc.paste(sym, offset, sym)
 
         return fc
 
     # -- Back card ---------------------------------------------------------
 
-    def _draw_back_text(
+    def _back_text(
         self,
-        canvas: Image.Image,
         rear_text: str,
         operation_text: str,
-        difficulty: str,
-        is_standard: bool,
-    ) -> None:
+        width: int,
+    ) -> tuple[list[_TextRun], _TextRun]:
         FONT_TOP_ORIG = 250
         FONT_BOT_ORIG = 260
         FONT_TOP_SMALL = 235
@@ -252,86 +430,385 @@ class CardCreator:
 
         font_top = self._font(font_top_sz)
         font_bot = self._font(font_bot_sz)
-        draw = ImageDraw.Draw(canvas)
-        w = canvas.size[0]
-        color = text_color_for(difficulty, is_standard)
 
         offsets = [
             TOP_TEXT_VERTICAL_OFFSET,
             TOP_TEXT_VERTICAL_OFFSET + 325,
             TOP_TEXT_VERTICAL_OFFSET + 650,
         ]
+        runs = []
         for text, y in zip([row1, row2, row3], offsets):
-            bbox = draw.textbbox((0, 0), text, font=font_top)
-            x = (w - bbox[2]) // 2
-            draw.text((x, y), text, fill=color, font=font_top)
+            bbox = font_top.getbbox(text)
+            x = (width - bbox[2]) // 2
+            runs.append(_text_run(text, font_top, (x, self._px(y)), self._raster_text))
 
+        # Placed without the Standard style's nudge; see _compose_back.
         op_clean = operation_text.strip('"')
-        bbox = draw.textbbox((0, 0), op_clean, font=font_bot)
-        x = (w - bbox[2]) // 2
-        y_nudge = 50 if is_standard else 0
-        y = BOTTOM_TEXT_VERTICAL_OFFSET + (BOTTOM_TEXT_BOX_HEIGHT - bbox[3]) // 2 + y_nudge
-        draw.text((x, y), op_clean, fill=color, font=font_bot)
-
-    def _place_back_image(self, canvas: Image.Image, asset_name: str) -> None:
-        path = self.config.assets_dir / f"{asset_name}.png"
-        img = Image.open(path)
-        scaled = (
-            int(img.size[0] * IMAGE_SCALE_FACTOR),
-            int(img.size[1] * IMAGE_SCALE_FACTOR),
+        bbox = font_bot.getbbox(op_clean)
+        x = (width - bbox[2]) // 2
+        y = (
+            self._px(BOTTOM_TEXT_VERTICAL_OFFSET)
+            + (self._px(BOTTOM_TEXT_BOX_HEIGHT) - bbox[3]) // 2
         )
-        img = img.resize(scaled)
-        w = canvas.size[0]
-        x = (w - scaled[0]) // 2
-        y = IMAGE_VERTICAL_OFFSET + (IMAGE_BOX_DIMENSIONS - scaled[1]) // 2
-        canvas.paste(img, (x, y), img)
-
-    def create_back(self, card: FlashCard) -> Image.Image:
-        diff_key = "standard" if self.style is Style.STANDARD else card.difficulty
-        fc = self._open_template("back", diff_key)
-
-        self._draw_back_text(
-            fc,
-            card.rear_text,
-            card.operation_text,
-            diff_key,
-            is_standard=(self.style is Style.STANDARD),
+        return runs, _text_run(op_clean, font_bot, (x, y), self._raster_text)
+
+    def _back_sprite(self, card: FlashCard) -> tuple[tuple[int, int], tuple[int, int]]:
+        """Size and position of the back sprite."""
+        width = self._px(TEMPLATE_SIZE[0])
+        img = load_sprite(
+            self._asset_path(card.asset_name), scale=IMAGE_SCALE_FACTOR * self.scale,
         )
-        self._place_back_image(fc, card.asset_name)
+        scaled = img.size
+        x = (width - scaled[0]) // 2
+        y = self._px(IMAGE_VERTICAL_OFFSET) + (self._px(IMAGE_BOX_DIMENSIONS) - scaled[1]) // 2
+        return scaled, (x, y)
+
+    def _plan_back(self, card: FlashCard) -> _BackPlan:
+        width = self._px(TEMPLATE_SIZE[0])
+        text, operation = self._back_text(card.rear_text, card.operation_text, width)
+        _size, (x, y) = self._back_sprite(card)
+        sprite = None
+        if self._raster_sprites:
+            sprite, (dx, dy) = load_trimmed_sprite(
+                self._asset_path(card.asset_name), scale=IMAGE_SCALE_FACTOR * self.scale,
+            )
+            x, y = x + dx, y + dy
+        return _BackPlan(text=text, operation=operation, sprite=sprite, sprite_pos=(x, y))
+
+    def _compose_back(self, card: FlashCard, style: Style, plan: _BackPlan) -> Image.Image:
+        fc = self._open_template("back", self._diff_key(card, style))
+        color = self._text_fill(card, "back", style)
+
+        for run in plan.text:
+            _draw_run(fc, run, color)
+        _draw_run(fc, plan.operation.shifted(self._operation_nudge(style)), color)
+
+        if plan.sprite is not None:
+            fc.paste(plan.sprite, plan.sprite_pos, plan.sprite)
         return fc
 
+    def _text_fill(self, card: FlashCard, side: str, style: Style) -> str | tuple[int, int, int]:
+        if side == "front":
+            return (255, 255, 255)
+        return text_color_for(self._diff_key(card, style), style is Style.STANDARD)
+
+    def _operation_nudge(self, style: Style) -> int:
+        """Extra drop of the back's operation line on Standard cards."""
+        return self._px(50) if style is Style.STANDARD else 0
+
+    # -- PDF-drawn text and sprites ------------------------------------------
+
+    def card_text(self, card: FlashCard, side: str, style: Style | None = None) -> list[CardText]:
+        """The text lines of one card side, placed as the raster renderer places them."""
+        style = style or self.style
+        if side == "front":
+            runs = self._front_text(card.front_text)
+        else:
+            runs, operation = self._back_text(
+                card.rear_text, card.operation_text, self._px(TEMPLATE_SIZE[0]),
+            )
+            runs.append(operation.shifted(self._operation_nudge(style)))
+        fill = self._text_fill(card, side, style)
+        color = fill if isinstance(fill, tuple) else ImageColor.getrgb(fill)[:3]
+        return [CardText(r.text, *r.origin, r.size, color) for r in runs]
+
+    def card_sprites(self, card: FlashCard, side: str) -> list[CardSprite]:
+        """Every asset sprite placement of one card side."""
+        path = self._asset_path(card.asset_name)
+        if side == "front":
+            num_top, _symbol, num_bottom = self._operands(card)
+            side_px, positions = self._sprite_grid(num_top, num_bottom)
+            return [CardSprite(path, x, y, side_px, side_px) for x, y in positions]
+        size, (x, y) = self._back_sprite(card)
+        return [CardSprite(path, x, y, *size)]
+
+    # -- Render cache ------------------------------------------------------
+
+    def content_key(self, card: FlashCard, side: str, style: Style | None = None) -> str:
+        """Hash of every input that determines the pixels of one card side."""
+        style = style or self.style
+        diff_key = self._diff_key(card, style)
+        kinds = ("front", "plus", "minus") if side == "front" else ("back",)
+        inputs = [self._template_path(kind, diff_key) for kind in kinds]
+        inputs += [
+            self.config.assets_dir / f"{card.asset_name}.png",
+            self.config.font_path,
+        ]
+        variant = side
+        if not self._raster_text:
+            variant += "-no-text"
+        if not self._raster_sprites:
+            variant += "-no-sprites"
+        return card_key(card, style, variant, self.scale, inputs)
+
+    def _cache_key(self, card: FlashCard, side: str, style: Style) -> str | None:
+        """Render-cache key of one card side, or None when the cache is off."""
+        if self._render_cache is None:
+            return None
+        return self.content_key(card, side, style)
+
+    def _render_side(
+        self,
+        card: FlashCard,
+        side: str,
+        styles: list[Style],
+        keys: dict[Style, str | None],
+    ) -> dict[Style, Image.Image]:
+        """Render one side of *card* in every style of *styles*.
+
+        Cache hits are loaded; the layout plan is built only if at least one
+        style has to be composited, and then shared by all of them.
+        """
+        images: dict[Style, Image.Image] = {}
+        plan: _FrontPlan | _BackPlan | None = None
+        for style in styles:
+            key = keys.get(style)
+            if key is not None:
+                cached = self._render_cache.get(key)
+                if cached is not None:
+                    images[style] = cached
+                    continue
+            if plan is None:
+                with span(f"plan_{side}", "render", card=card.index):
+                    plan = self._plan_front(card) if side == "front" else self._plan_back(card)
+            with span(f"compose_{side}", "render", card=card.index, style=style.value):
+                if side == "front":
+                    img = self._compose_front(card, style, plan)
+                else:
+                    img = self._compose_back(card, style, plan)
+            if key is not None:
+                self._render_cache.put(key, img)
+            images[style] = img
+        return images
+
+    def create_front(self, card: FlashCard, style: Style | None = None) -> Image.Image:
+        style = style or self.style
+        keys = {style: self._cache_key(card, "front", style)}
+        return self._render_side(card, "front", [style], keys)[style]
+
+    def create_back(self, card: FlashCard, style: Style | None = None) -> Image.Image:
+        style = style or self.style
+        keys = {style: self._cache_key(card, "back", style)}
+        return self._render_side(card, "back", [style], keys)[style]
+
     # -- Bulk generation ---------------------------------------------------
 
+    def _render_card(
+        self,
+        card: FlashCard,
+        keep_images: bool = False,
+    ) -> tuple[list[Path], list[tuple[Style, str, Image.Image]]]:
+        """Render the front + back of one card in every style.
+
+        PNGs are written only when ``config.save_intermediates`` is set.  With
+        *keep_images* the rendered images are returned alongside the paths
+        instead of being closed.
+        """
+        with span("card", "card", card=card.index):
+            return self._render_card_sides(card, keep_images)
+
+    def _render_card_sides(
+        self,
+        card: FlashCard,
+        keep_images: bool,
+    ) -> tuple[list[Path], list[tuple[Style, str, Image.Image]]]:
+        save = self.config.save_intermediates
+        paths: list[Path] = []
+        images: list[tuple[Style, str, Image.Image]] = []
+        for name, side in (
+            (front_name(card.index, self.config.card_suffix), "front"),
+            (back_name(card.index, self.config.card_suffix), "back"),
+        ):
+            keys = {s: self._cache_key(card, side, s) for s in self.styles}
+            todo: list[Style] = []
+            for style in self.styles:
+                # A cached card that only needs saving is copied without decoding.
+                key = keys[style]
+                path = self.output_dirs[style] / name
+                if save and not keep_images and key is not None:
+                    if self._render_cache.copy_to(key, path):
+                        paths.append(path)
+                        continue
+                todo.append(style)
+
+            for style, img in self._render_side(card, side, todo, keys).items():
+                if save:
+                    path = self.output_dirs[style] / name
+                    key = keys[style]
+                    if key is None or not self._render_cache.copy_to(key, path):
+                        with span("card_encode", "io", file=name, style=style.value):
+                            save_card(img, path, self.config)
+                    paths.append(path)
+                if keep_images:
+                    images.append((style, name, img))
+                else:
+                    img.close()
+        return paths, images
+
     def generate_all(
         self,
         cards: list[FlashCard],
         progress: ProgressCallback = None,
         cancelled: Callable[[], bool] | None = None,
+        sink: ImageSink = None,
     ) -> list[Path]:
-        """Create front + back PNGs for every card. Returns list of created file paths."""
+        """Create front + back images for every card. Returns list of created file paths.
+
+        Every rendered image is passed to ``sink(style, file_name, image)`` when a
+        *sink* is given, so Stage 3 can consume cards without a PNG round-trip.
+        With ``config.workers > 1`` the cards are split across a process pool.
+        If the run is cancelled, every file created so far is deleted before
+        :class:`PipelineCancelled` propagates.  Once every card is saved, a
+        :class:`RunManifest` of the run is written next to the images.
+        """
         total = len(cards)
-        label = self.style.value
         created_files: list[Path] = []
 
+        try:
+            rendered = self.iter_render(
+                cards, created_files, cancelled, keep_images=sink is not None,
+            )
+            for done, (_card, images) in enumerate(rendered, 1):
+                _feed_sink(sink, images)
+                if progress:
+                    progress(done, total, self.label)
+        except PipelineCancelled:
+            cleanup_files(created_files)
+            raise
+
+        created_files += self.finish(cards)
+        return created_files
+
+    def finish(self, cards: list[FlashCard]) -> list[Path]:
+        """Write the run manifest once every card is saved; returns the files written."""
+        if not self.config.save_intermediates:
+            logger.info("%d %s flashcards rendered in memory", len(cards), self.label)
+            return []
+        manifest = RunManifest.from_cards(cards, self.config.card_suffix)
+        files = [manifest.save(d) for d in self.output_dirs.values()]
+        for style, output_dir in self.output_dirs.items():
+            logger.info("%d %s flashcards saved to %s", len(cards), style.value, output_dir)
+        return files
+
+    def iter_render(
+        self,
+        cards: list[FlashCard],
+        created_files: list[Path],
+        cancelled: Callable[[], bool] | None = None,
+        keep_images: bool = False,
+    ) -> Iterator[tuple[FlashCard, list[tuple[Style, str, Image.Image]]]]:
+        """Render *cards*, yielding ``(card, images)`` as each one is finished.
+
+        Saved files are appended to *created_files* as they are written —
+        including those of cards still in flight when the iteration stops —
+        so the caller can clean them up.  With ``config.workers > 1`` cards
+        are rendered in a process pool, a few ahead of the caller, and yielded
+        in completion order.
+        *images* is empty unless *keep_images* is set.
+        """
+        if self.config.workers > 1 and len(cards) > 1:
+            yield from self._iter_parallel(cards, created_files, cancelled, keep_images)
+            return
         for card in cards:
             check_cancelled(cancelled)
+            paths, images = self._render_card(card, keep_images)
+            created_files.extend(paths)
+            yield card, images
 
-            front_path = self.output_dir / f"Card_{card.index}.png"
-            front = self.create_front(card)
-            front.save(front_path, "PNG")
-            front.close()
-            created_files.append(front_path)
+    def _iter_parallel(
+        self,
+        cards: list[FlashCard],
+        created_files: list[Path],
+        cancelled: Callable[[], bool] | None,
+        keep_images: bool,
+    ) -> Iterator[tuple[FlashCard, list[tuple[Style, str, Image.Image]]]]:
+        tracer = current_tracer()
+
+        workers = min(self.config.workers, len(cards))
+        queue = iter(cards)
+        # Only a couple of cards per worker are queued ahead of the caller, so
+        # finished renders cannot pile up while it is busy with earlier ones.
+        pending: dict[Future[_WorkerResult], FlashCard] = {}
+
+        with ProcessPoolExecutor(
+            max_workers=workers,
+            mp_context=multiprocessing.get_context("spawn"),
+            initializer=_init_worker,
+            initargs=(self.config, self.styles, self.size, tracer is not None),
+        ) as pool:
+
+            def _submit_next() -> None:
+                card = next(queue, None)
+                if card is not None:
+                    pending[pool.submit(_render_in_worker, card, keep_images)] = card
+
+            for _ in range(2 * workers):
+                _submit_next()
+            try:
+                while pending:
+                    check_cancelled(cancelled)
+                    done, _ = wait(pending, timeout=0.2, return_when=FIRST_COMPLETED)
+                    for fut in done:
+                        card = pending.pop(fut)
+                        paths, images, spans = fut.result()
+                        if tracer is not None:
+                            tracer.extend(spans)
+                        created_files.extend(paths)
+                        _submit_next()
+                        yield card, images
+                        del images
+            finally:
+                for fut in pending:
+                    fut.cancel()
+                # Renders already in flight still write their files — wait for
+                # them so they can be cleaned up as well.
+                for fut in pending:
+                    if not fut.cancelled() and fut.exception() is None:
+                        created_files.extend(fut.result()[0])
+
+
+def _feed_sink(sink: ImageSink, images: list[tuple[Style, str, Image.Image]]) -> None:
+    """Hand each rendered image to *sink*, then release it."""
+    for style, name, img in images:
+        if sink is not None:
+            sink(style, name, img)
+        img.close()
 
-            back_path = self.output_dir / f"Card_{card.index}_Back.png"
-            back = self.create_back(card)
-            back.save(back_path, "PNG")
-            back.close()
-            created_files.append(back_path)
 
-            if progress:
-                progress(card.index, total, label)
+# ---------------------------------------------------------------------------
+# Process-pool workers
+# ---------------------------------------------------------------------------
 
-        logger.info(
-            "%d %s flashcards saved to %s", total, label, self.output_dir,
-        )
-        return created_files
+_WorkerResult = tuple[list[Path], list[tuple[Style, str, Image.Image]], list[Span]]
+
+_worker_creator: CardCreator | None = None
+_worker_tracer: Tracer | None = None
+
+
+def _init_worker(
+    config: PipelineConfig,
+    styles: list[Style],
+    size: CardSize | None,
+    tracing: bool = False,
+) -> None:
+    """Build the per-process :class:`CardCreator` used by :func:`_render_in_worker`.
+
+    With *tracing*, spans recorded in the worker are returned with each card.
+    """
+    global _worker_creator, _worker_tracer
+    shared_cache().resize(config.cache_max_bytes)
+    _worker_creator = CardCreator(config, styles, size)
+    if tracing:
+        _worker_tracer = Tracer()
+        install(_worker_tracer)
+
+
+def _render_in_worker(
+    card: FlashCard,
+    keep_images: bool,
+) -> _WorkerResult:
+    if _worker_creator is None:
+        raise RuntimeError("Worker process was not initialised.")
+    paths, images = _worker_creator._render_card(card, keep_images)
+    spans = _worker_tracer.drain() if _worker_tracer is not None else []
+    return paths, images, spans
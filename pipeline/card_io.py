@@ -0,0 +1,93 @@
+"""Card image files between Stage 2 and Stage 3 — PNG, TIFF, WebP or raw NPY."""
+
+from __future__ import annotations
+
+import ast
+import logging
+import mmap
+import struct
+from pathlib import Path
+
+from PIL import Image
+
+from pipeline.config import CardFormat, PipelineConfig
+
+logger = logging.getLogger(__name__)
+
+CARD_SUFFIXES = {f".{fmt.value}" for fmt in CardFormat}
+
+_NPY_MAGIC = b"\x93NUMPY\x01\x00"
+# Bands per pixel -> PIL mode, for NPY shapes (h, w) and (h, w, bands)
+_NPY_MODES = {1: "L", 3: "RGB", 4: "RGBA"}
+
+
+# ---------------------------------------------------------------------------
+# Saving
+# ---------------------------------------------------------------------------
+
+def save_card(img: Image.Image, path: Path, config: PipelineConfig) -> None:
+    """Write *img* to *path* in ``config.card_format``."""
+    fmt = config.card_format
+    if fmt is CardFormat.PNG:
+        img.save(path, "PNG", compress_level=config.png_compress_level)
+    elif fmt is CardFormat.TIFF:
+        img.save(path, "TIFF", compression="tiff_lzw")
+    elif fmt is CardFormat.WEBP:
+        # exact keeps the colour of fully transparent pixels, so it stays lossless
+        img.save(path, "WEBP", lossless=True, quality=0, method=0, exact=True)
+    elif fmt is CardFormat.NPY:
+        _save_npy(img, path)
+    else:
+        raise ValueError(f"Unknown card format: {fmt}")
+
+
+def _save_npy(img: Image.Image, path: Path) -> None:
+    """Write *img* as a ``uint8`` ``.npy`` array of shape (h, w[, bands])."""
+    bands = len(img.getbands())
+    if bands not in _NPY_MODES or img.mode != _NPY_MODES[bands]:
+        img = img.convert("RGBA")
+        bands = 4
+    w, h = img.size
+    shape = (h, w) if bands == 1 else (h, w, bands)
+    header = repr({"descr": "|u1", "fortran_order": False, "shape": shape})
+    # Pad so the pixel data starts on a 64-byte boundary, as numpy does.
+    pad = -(len(_NPY_MAGIC) + 2 + len(header) + 1) % 64
+    header = (header + " " * pad + "\n").encode("latin1")
+    with open(path, "wb") as f:
+        f.write(_NPY_MAGIC + struct.pack("<H", len(header)) + header)
+        f.write(img.tobytes())
+
+
+# ---------------------------------------------------------------------------
+# Loading
+# ---------------------------------------------------------------------------
+
+def open_card(path: Path) -> Image.Image:
+    """Load the card image at *path*, whichever format it was saved in.
+
+    NPY files are memory-mapped rather than read: the returned image is a
+    read-only view of the file, paged in as it is used.
+    """
+    if path.suffix.lower() == ".npy":
+        return _open_npy(path)
+    img = Image.open(path)
+    img.load()
+    return img
+
+
+def _open_npy(path: Path) -> Image.Image:
+    with open(path, "rb") as f:
+        mapped = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+    if mapped[: len(_NPY_MAGIC)] != _NPY_MAGIC:
+        raise ValueError(f"Not a version 1.0 .npy file: {path}")
+    (header_len,) = struct.unpack_from("<H", mapped, len(_NPY_MAGIC))
+    start = len(_NPY_MAGIC) + 2
+    header = ast.literal_eval(mapped[start : start + header_len].decode("latin1"))
+    shape = header["shape"]
+    bands = shape[2] if len(shape) == 3 else 1
+    if header["descr"] != "|u1" or header["fortran_order"] or bands not in _NPY_MODES:
+        raise ValueError(f"Unsupported card array in {path}: {header}")
+    mode = _NPY_MODES[bands]
+    # The image keeps the mapping alive for as long as it is referenced.
+    data = memoryview(mapped)[start + header_len :]
+    return Image.frombuffer(mode, (shape[1], shape[0]), data, "raw", mode, 0, 1)
@@ -2,11 +2,14 @@
 
 from __future__ import annotations
 
+import logging
 from dataclasses import dataclass, field
 from enum import Enum
 from pathlib import Path
 from typing import Callable
 
+logger = logging.getLogger(__name__)
+
 
 # ---------------------------------------------------------------------------
 # Cancellation
@@ -22,6 +25,15 @@ def check_cancelled(cancelled: Callable[[], bool] | None) -> None:
         raise PipelineCancelled("Pipeline cancelled by user.")
 
 
+def cleanup_files(files: list[Path]) -> None:
+    """Delete every file in *files* that still exists on disk."""
+    for f in files:
+        try:
+            f.unlink(missing_ok=True)
+        except OSError:
+            logger.warning("Could not delete %s", f)
+
+
 # ---------------------------------------------------------------------------
 # Enums
 # ---------------------------------------------------------------------------
@@ -48,6 +60,14 @@ class CardSize(str, Enum):
     SMALL = "Small"
 
 
+class CardFormat(str, Enum):
+    """File format of the Stage 2 card images (see pipeline.card_io)."""
+    PNG = "png"
+    TIFF = "tiff"    # LZW — fast lossless, larger files
+    WEBP = "webp"    # lossless at the fastest effort
+    NPY = "npy"      # raw pixels, memory-mapped back in Stage 3
+
+
 # ---------------------------------------------------------------------------
 # Data model
 # ---------------------------------------------------------------------------
@@ -80,9 +100,48 @@ class PipelineConfig:
     styles: list[Style] = field(default_factory=lambda: [Style.STANDARD, Style.COLOR_GRADED])
     sizes: list[CardSize] = field(default_factory=lambda: [CardSize.MEDIUM, CardSize.SMALL])
     random_seed: int = 234
+    # Number of worker processes for Stage 2; 1 renders serially in-process.
+    workers: int = 1
+    # Byte budget of the process-wide template/font/sprite cache.
+    cache_max_bytes: int = 1 << 30
+    # Write Stage 2 card images to gen_dir; when False cards stream to Stage 3 in
+    # memory, with PDFs assembled while cards render (as with pipelined).
+    save_intermediates: bool = True
+    # Format of those card images (and of the render cache); PNG is the
+    # smallest, the others trade disk space for encode/decode time.
+    card_format: CardFormat = CardFormat.PNG
+    # zlib level for PNG cards, 0 (none) to 9 (smallest).
+    png_compress_level: int = 6
+    # Render each card directly at its output size instead of at TEMPLATE_SIZE.
+    print_scale: bool = False
+    # Output resolution of the PDF pages; None keeps the page templates' own DPI.
+    dpi: int | None = None
+    # Reuse rendered cards across runs from a content-addressed cache.
+    render_cache: bool = False
+    # Rebuild only the PDF sheets whose cards changed since the last build.
+    incremental_pdf: bool = False
+    # Ceiling on decoded card images Stage 3 holds at once (read-ahead included).
+    pdf_memory_bytes: int = 256 << 20
+    # Where generated output goes; None means base_path / "Gen".
+    gen_root: Path | None = None
+    # Assemble PDF sheets while Stage 2 is still rendering (see pipeline.pipelined).
+    pipelined: bool = False
+    # Draw card text into the PDF as real text in the embedded font; the card
+    # bitmaps are then rendered without it.
+    vector_text: bool = False
+    # Place asset sprites in the PDF, each embedded once per document, instead
+    # of pasting them into every card bitmap.
+    vector_sprites: bool = False
+    # Flatten each card onto the page template beneath it and embed it as RGB,
+    # so the PDF carries no per-card soft masks.
+    flatten_cards: bool = False
 
     # Derived paths --------------------------------------------------------
 
+    @property
+    def output_root(self) -> Path:
+        return self.gen_root or self.base_path / "Gen"
+
     @property
     def assets_dir(self) -> Path:
         return self.base_path / "input" / "Assets" / self.asset_pack
@@ -95,20 +154,28 @@ class PipelineConfig:
     def font_path(self) -> Path:
         return self.base_path / "input" / "Assets" / "Quicksand-Bold.ttf"
 
-    def gen_dir(self, style: Style) -> Path:
-        return (
-            self.base_path
-            / "Gen"
+    def gen_dir(self, style: Style, size: CardSize | None = None) -> Path:
+        path = (
+            self.output_root
             / self.asset_pack
             / "Flash Cards"
             / self.operation.value
             / style.value
         )
+        # Print-scale cards are size specific, so they get their own folder.
+        return path / size.value if size is not None else path
+
+    @property
+    def card_suffix(self) -> str:
+        return f".{self.card_format.value}"
+
+    @property
+    def render_cache_dir(self) -> Path:
+        return self.base_path / "Gen" / ".render_cache"
 
     def pdf_dir(self, style: Style) -> Path:
         return (
-            self.base_path
-            / "Gen"
+            self.output_root
             / self.asset_pack
             / "Final_PDFs"
             / self.operation.value
@@ -117,8 +184,7 @@ class PipelineConfig:
 
     def ops_file_path(self) -> Path:
         return (
-            self.base_path
-            / "Gen"
+            self.output_root
             / self.asset_pack
             / "Flash Cards"
             / self.operation.value
@@ -0,0 +1,65 @@
+"""Typed progress events from ``run_pipeline(on_event=…)`` and ``iter_pipeline``."""
+
+from __future__ import annotations
+
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Callable, Union
+
+from PIL import Image
+
+from pipeline.config import CardSize, Style
+
+
+@dataclass(frozen=True)
+class StageStarted:
+    message: str
+
+
+@dataclass(frozen=True)
+class CardRendered:
+    current: int
+    total: int
+    label: str
+
+
+@dataclass(frozen=True)
+class CardImage:
+    """One rendered card side, yielded by ``iter_pipeline``.
+
+    *image* is closed when the iterator resumes; ``copy()`` it to keep it.
+    *path* is None unless intermediates are saved.  *size* is None unless
+    cards are rendered at print scale.
+    """
+    style: Style
+    size: CardSize | None
+    name: str
+    image: Image.Image
+    path: Path | None
+
+
+@dataclass(frozen=True)
+class PageWritten:
+    """*pages* of *total* pages of one PDF have been drawn."""
+    style: Style
+    size: CardSize
+    pages: int
+    total: int
+
+
+@dataclass(frozen=True)
+class PdfWritten:
+    style: Style
+    size: CardSize
+    path: Path
+
+
+@dataclass(frozen=True)
+class PipelineFinished:
+    pdfs: list[Path]
+
+
+PipelineEvent = Union[
+    StageStarted, CardRendered, CardImage, PageWritten, PdfWritten, PipelineFinished,
+]
+EventCallback = Callable[[PipelineEvent], None] | None
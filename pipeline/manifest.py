@@ -0,0 +1,125 @@
+"""Run manifest — the cards Stage 2 rendered, in the order Stage 3 prints them."""
+
+from __future__ import annotations
+
+import json
+import logging
+from dataclasses import dataclass
+from pathlib import Path
+
+from pipeline.config import Difficulty, FlashCard
+
+logger = logging.getLogger(__name__)
+
+MANIFEST_NAME = "manifest.json"
+MANIFEST_VERSION = 1
+
+# Cards are printed easiest first; within a difficulty they keep deck order.
+_DIFFICULTY_PRIORITY = {Difficulty.EASY: 1, Difficulty.MEDIUM: 2, Difficulty.HARD: 3}
+
+
+def front_name(index: int, suffix: str = ".png") -> str:
+    return f"Card_{index}{suffix}"
+
+
+def back_name(index: int, suffix: str = ".png") -> str:
+    return f"Card_{index}_Back{suffix}"
+
+
+def is_back(name: str) -> bool:
+    return Path(name).stem.endswith("_Back")
+
+
+@dataclass(frozen=True)
+class ManifestEntry:
+    """One rendered card: its image file names, difficulty and print position."""
+    index: int
+    difficulty: Difficulty
+    sort_key: tuple[int, int]
+    front: str
+    back: str
+
+
+class RunManifest:
+    """Index of the cards of one run, keyed by card index.
+
+    Stage 3 reads card files and print order from here instead of listing
+    and regex-sorting the image folder, so PNGs left behind by earlier runs
+    are never picked up.
+    """
+
+    def __init__(self, entries: list[ManifestEntry]) -> None:
+        self._entries = {e.index: e for e in entries}
+
+    @classmethod
+    def from_cards(cls, cards: list[FlashCard], suffix: str = ".png") -> RunManifest:
+        """Manifest of *cards* whose images are named with *suffix*."""
+        ranks: dict[Difficulty, int] = {}
+        entries = []
+        for card in cards:
+            rank = ranks.get(card.difficulty, 0)
+            ranks[card.difficulty] = rank + 1
+            entries.append(ManifestEntry(
+                index=card.index,
+                difficulty=card.difficulty,
+                sort_key=(_DIFFICULTY_PRIORITY.get(card.difficulty, 4), rank),
+                front=front_name(card.index, suffix),
+                back=back_name(card.index, suffix),
+            ))
+        return cls(entries)
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def __contains__(self, index: int) -> bool:
+        return index in self._entries
+
+    def __getitem__(self, index: int) -> ManifestEntry:
+        return self._entries[index]
+
+    def ordered(self) -> list[ManifestEntry]:
+        """Entries in print order (by difficulty, then deck order)."""
+        return sorted(self._entries.values(), key=lambda e: e.sort_key)
+
+    # -- Persistence -------------------------------------------------------
+
+    def save(self, folder: Path) -> Path:
+        """Write the manifest into the image *folder*; returns its path."""
+        path = folder / MANIFEST_NAME
+        data = {
+            "version": MANIFEST_VERSION,
+            "cards": [
+                {
+                    "index": e.index,
+                    "difficulty": e.difficulty.value,
+                    "sort_key": list(e.sort_key),
+                    "front": e.front,
+                    "back": e.back,
+                }
+                for e in self._entries.values()
+            ],
+        }
+        path.write_text(json.dumps(data, indent=1))
+        return path
+
+    @classmethod
+    def load(cls, folder: Path) -> RunManifest | None:
+        """Read the manifest of an image *folder*, or None if it has none."""
+        path = folder / MANIFEST_NAME
+        try:
+            data = json.loads(path.read_text())
+        except FileNotFoundError:
+            return None
+        if data.get("version") != MANIFEST_VERSION:
+            logger.warning("Ignoring manifest with unknown version: %s", path)
+            return None
+        return cls([
+            ManifestEntry(
+                index=c["index"],
+                difficulty=Difficulty(c["difficulty"]),
+                sort_key=tuple(c["sort_key"]),
+                front=c["front"],
+                back=c["back"],
+            )
+            for c in data["cards"]
+        ])
@@ -16,6 +16,7 @@ from pipeline.config import (
     PipelineConfig,
     number_word,
 )
+from pipeline.resources import open_bundle, pack_bundle_path
 
 logger = logging.getLogger(__name__)
 
@@ -44,6 +45,26 @@ def get_asset_names(assets_dir: Path) -> list[str]:
     return names
 
 
+def compiled_assets(assets_dir: Path) -> dict[str, str] | None:
+    """Return ``{name: plural}`` from the pack's compiled index, if it is current.
+
+    The index (see pipeline.asset_pack) stays current while the pack folder's
+    mtime is unchanged, i.e. until an asset is added, removed or renamed.
+    """
+    bundle = open_bundle(pack_bundle_path(assets_dir))
+    pack = bundle.index.get("pack") if bundle is not None else None
+    if pack is None:
+        return None
+    try:
+        mtime_ns = assets_dir.stat().st_mtime_ns
+    except FileNotFoundError:
+        return None
+    if mtime_ns != pack["mtime_ns"]:
+        logger.info("Compiled index of %s is out of date; rescanning", assets_dir.name)
+        return None
+    return {name: asset["plural"] for name, asset in pack["assets"].items()}
+
+
 # ---------------------------------------------------------------------------
 # Pluralisation (inflect — replaces Ollama)
 # ---------------------------------------------------------------------------
@@ -179,12 +200,16 @@ def generate_cards(
     progress: ProgressCallback = None,
 ) -> list[FlashCard]:
     """Generate all flashcard data. Returns an in-memory list of cards."""
-    asset_names = get_asset_names(config.assets_dir)
-    if not asset_names:
-        raise FileNotFoundError(f"No assets found in {config.assets_dir}")
+    plural_map = compiled_assets(config.assets_dir)
+    if plural_map is not None:
+        asset_names = sorted(plural_map)
+    else:
+        asset_names = get_asset_names(config.assets_dir)
+        if not asset_names:
+            raise FileNotFoundError(f"No assets found in {config.assets_dir}")
 
-    logger.info("Pluralising %d asset names with inflect…", len(asset_names))
-    plural_map = pluralize(asset_names)
+        logger.info("Pluralising %d asset names with inflect…", len(asset_names))
+        plural_map = pluralize(asset_names)
 
     pairs = generate_math_pairs(config.operation, config.random_seed)
     assignments = assign_assets(pairs, asset_names, config.random_seed)
@@ -2,97 +2,358 @@
 
 from __future__ import annotations
 
+import contextvars
+import hashlib
+import io
+import json
 import logging
+import os
 import re
-import tempfile
+from collections import deque
+from concurrent.futures import Future, ThreadPoolExecutor
+from contextlib import closing
+from dataclasses import dataclass
 from pathlib import Path
-from typing import Callable
+from typing import Callable, Generator, Iterable, Iterator
 
 from PIL import Image
 from reportlab.lib.pagesizes import A4
+from reportlab.lib.utils import ImageReader
+from reportlab.pdfbase import pdfmetrics
+from reportlab.pdfbase.pdfdoc import xObjectName
+from reportlab.pdfbase.ttfonts import TTFont
 from reportlab.pdfgen import canvas
 
 import pypdf
-
-from pipeline.config import CardSize, Difficulty, FlashCard, PipelineConfig, Style, check_cancelled
+from pypdf.generic import IndirectObject, NameObject
+
+from pipeline.card_creator import CardCreator, CardSprite, CardText
+from pipeline.card_io import CARD_SUFFIXES, open_card
+from pipeline.config import (
+    IMAGE_SCALE_FACTOR,
+    TEMPLATE_SIZE,
+    CardSize,
+    FlashCard,
+    PipelineConfig,
+    Style,
+    check_cancelled,
+)
+from pipeline.events import PageWritten
+from pipeline.manifest import ManifestEntry, RunManifest, is_back
 from pipeline.pdf_settings import TEMPLATE_DIR, FlashCardLayout, get_layout
+from pipeline.render_cache import file_digest
+from pipeline.resources import load_sprite, load_template
+from pipeline.tracing import span
 
 logger = logging.getLogger(__name__)
 
 ProgressCallback = Callable[[str], None] | None
+PageCallback = Callable[[int, int], None] | None
 
 
 # ---------------------------------------------------------------------------
-# Helpers
+# Image pre-processing
 # ---------------------------------------------------------------------------
 
-def _natural_sort_key(text: str) -> list[int | str]:
-    return [int(c) if c.isdigit() else c.lower() for c in re.split(r"(\d+)", text)]
-
-
-def _mirror_page(page: pypdf.PageObject) -> pypdf.PageObject:
-    """Rotate 180 ° and flip vertically — needed for double-sided printing."""
-    page.rotate(180)
-    page.scale(1, -1)
-    return page
+def preprocess_image(
+    name: str,
+    img: Image.Image,
+    layout: FlashCardLayout,
+) -> Image.Image:
+    """Orient one card image for *layout* and scale it to the output DPI.
 
+    Cards rendered in print-scale mode already have their final size.
+    """
+    img = img.convert("RGBA")
 
-def _difficulty_order(cards: list[FlashCard]) -> dict[str, list[int]]:
-    """Build card-index → difficulty lookup from in-memory cards."""
-    order: dict[str, list[int]] = {"Easy": [], "Medium": [], "Hard": []}
-    for card in cards:
-        label = card.difficulty.value.capitalize()
-        if label in order:
-            order[label].append(card.index)
-    return order
+    if is_back(name):
+        img = layout.preprocess_back_image(img)
 
+    if layout.config.print_scale:
+        return img
 
-def _sort_score(
-    image_name: str,
-    order: dict[str, list[int]],
-) -> tuple[int, int]:
-    match = re.search(r"\d+", image_name)
-    if match:
-        idx = int(match.group())
-        for diff, priority in [("Easy", 1), ("Medium", 2), ("Hard", 3)]:
-            if idx in order[diff]:
-                return priority, order[diff].index(idx)
-    return 4, 9999
+    new_w = int(img.size[0] * layout.card_scale)
+    new_h = int(img.size[1] * layout.card_scale)
+    with span("resize_card", "resource", file=name):
+        return img.resize((new_w, new_h), Image.Resampling.LANCZOS)
 
 
-# ---------------------------------------------------------------------------
-# Image pre-processing
-# ---------------------------------------------------------------------------
-
 def _preprocess_images(
     image_folder: Path,
     layout: FlashCardLayout,
+    names: set[str] | None = None,
 ) -> dict[str, Image.Image]:
+    """Decode and preprocess the card images in *image_folder* (only *names*, if given)."""
     processed: dict[str, Image.Image] = {}
     if not image_folder.is_dir():
         logger.error("Image folder not found: %s", image_folder)
         return processed
 
-    for p in sorted(image_folder.iterdir()):
-        if p.suffix.lower() != ".png":
-            continue
-        img = Image.open(p).convert("RGBA")
+    if names is None:
+        paths = [p for p in sorted(image_folder.iterdir()) if p.suffix.lower() in CARD_SUFFIXES]
+    else:
+        paths = [image_folder / n for n in sorted(names)]
+    for p in paths:
+        with span("load_card", "io", file=p.name), open_card(p) as img:
+            processed[p.name] = preprocess_image(p.name, img, layout)
 
-        if p.name.endswith("_Back.png"):
-            img = layout.preprocess_back_image(img)
+    return processed
 
-        new_w = int(img.size[0] * layout.SCALE)
-        new_h = int(img.size[1] * layout.SCALE)
-        img = img.resize((new_w, new_h), Image.Resampling.LANCZOS)
-        processed[p.name] = img
 
-    return processed
+def _sheet_nbytes(layout: FlashCardLayout, sheet: tuple[list[str], list[str]]) -> int:
+    """Estimated decoded size of every card on one sheet (front + back page)."""
+    w = int(TEMPLATE_SIZE[0] * layout.card_scale)
+    h = int(TEMPLATE_SIZE[1] * layout.card_scale)
+    return w * h * 4 * (len(sheet[0]) + len(sheet[1]))
+
+
+def _stream_sheets(
+    image_folder: Path,
+    layout: FlashCardLayout,
+    sheets: list[tuple[list[str], list[str]]],
+    todo: list[int],
+    max_bytes: int,
+) -> Iterator[tuple[int, dict[str, Image.Image]]]:
+    """Yield ``(sheet_no, images)`` for each sheet in *todo*, loading per sheet.
+
+    A background thread reads ahead while the caller draws, holding as many
+    sheets as fit in *max_bytes* (at least one).  Each sheet's images are
+    closed as soon as the caller moves on, so peak memory does not grow with
+    the size of the deck.
+    """
+    per_sheet = max((_sheet_nbytes(layout, sheets[n]) for n in todo), default=1)
+    window = max(1, max_bytes // per_sheet)
+    queue = iter(todo)
+    pending: deque[tuple[int, Future[dict[str, Image.Image]]]] = deque()
+
+    with ThreadPoolExecutor(max_workers=1, thread_name_prefix="pdf-load") as pool:
+
+        def _submit_next() -> None:
+            sheet_no = next(queue, None)
+            if sheet_no is None:
+                return
+            fronts, backs = sheets[sheet_no]
+            ctx = contextvars.copy_context()
+            pending.append((sheet_no, pool.submit(
+                ctx.run, _preprocess_images, image_folder, layout, set(fronts + backs),
+            )))
+
+        for _ in range(window):
+            _submit_next()
+        while pending:
+            sheet_no, future = pending.popleft()
+            images = future.result()
+            try:
+                yield sheet_no, images
+            finally:
+                for img in images.values():
+                    img.close()
+            _submit_next()
+
+
+def _sheets_from_feed(
+    feed: Iterable[tuple[str, Image.Image]],
+    layout: FlashCardLayout,
+    sheets: list[tuple[list[str], list[str]]],
+    todo: list[int],
+) -> Iterator[tuple[int, dict[str, Image.Image]]]:
+    """Yield ``(sheet_no, images)`` for each sheet in *todo* once its cards arrive.
+
+    *feed* delivers ``(name, image)`` pairs as Stage 2 renders them, roughly
+    in print order and hands each image over to this generator, which closes
+    it once preprocessed.  Cards are held only until their sheet is drawn;
+    cards of sheets not in *todo* are dropped.
+    """
+    wanted = {name for n in todo for name in sheets[n][0] + sheets[n][1]}
+    arrived: dict[str, Image.Image] = {}
+    cards = iter(feed)
+    try:
+        for sheet_no in todo:
+            names = sheets[sheet_no][0] + sheets[sheet_no][1]
+            for name in names:
+                while name not in arrived:
+                    try:
+                        got, img = next(cards)
+                    except StopIteration:
+                        raise RuntimeError(f"Card feed ended before {name} arrived") from None
+                    if got in wanted:
+                        arrived[got] = preprocess_image(got, img, layout)
+                    img.close()
+            images = {name: arrived.pop(name) for name in names}
+            try:
+                yield sheet_no, images
+            finally:
+                for img in images.values():
+                    img.close()
+    finally:
+        for img in arrived.values():
+            img.close()
+
+
+# ---------------------------------------------------------------------------
+# PDF-drawn text and sprites
+# ---------------------------------------------------------------------------
+
+def _pdf_font(path: Path) -> str:
+    """Register the TrueType font at *path* with reportlab once; returns its name.
+
+    reportlab embeds only the glyphs a document actually uses.
+    """
+    name = f"Card-{path.stem}"
+    if name not in pdfmetrics.getRegisteredFontNames():
+        pdfmetrics.registerFont(TTFont(name, str(path)))
+    return name
+
+
+def _sprite_form(path: Path) -> str:
+    return "sprite_" + re.sub(r"\W", "_", f"{path.parent.name}_{path.stem}")
+
+
+@dataclass
+class _CardExtras:
+    """What the PDF draws over one card bitmap."""
+    sprites: list[CardSprite]
+    text: list[CardText]
+
+
+def _card_orientation(
+    layout: FlashCardLayout,
+    index: int,
+    back: bool,
+) -> tuple[tuple[int, int], tuple[int, int], tuple[int, int]]:
+    """How the card at *index* is turned on the page.
+
+    Returns the directions the card's x and y axes point in on the page, and
+    which corner of the placed image (0 or 1 per axis) its top-left corner
+    ends up in.  A 2x2 probe goes through the same back-side and layout
+    transforms as the card image, so this follows the layout classes.
+    """
+    probe = Image.new("L", (2, 2))
+    probe.putdata([1, 2, 3, 0])
+    if back:
+        probe = layout.preprocess_back_image(probe)
+    probe = layout.get_layout(index, probe)[0]
+    where = {probe.getpixel((x, y)): (x, y) for x in (0, 1) for y in (0, 1)}
+    (x1, y1), (x2, y2), (x3, y3) = where[1], where[2], where[3]
+    return (x2 - x1, y2 - y1), (x3 - x1, y3 - y1), (x1, y1)
+
+
+class _CardOverlay:
+    """Card text and sprites drawn in the PDF over card bitmaps rendered without them.
+
+    Text is set in the embedded font (``config.vector_text``); each asset
+    sprite becomes one form XObject per document that every placement
+    refers to (``config.vector_sprites``).
+    """
+
+    def __init__(
+        self,
+        config: PipelineConfig,
+        style: Style,
+        size: CardSize,
+        cards: list[FlashCard],
+    ) -> None:
+        self.style = style
+        self.text = config.vector_text
+        self.sprites = config.vector_sprites
+        self.creator = CardCreator(config, style, size if config.print_scale else None)
+        self.font = _pdf_font(config.font_path) if self.text else ""
+        # Sprites are embedded at the resolution of their largest placement
+        # (the back's), or at their own if that is smaller.
+        self._sprite_scale = min(1.0, IMAGE_SCALE_FACTOR * get_layout(size, config, style).card_scale)
+        self._cards = {card.index: card for card in cards}
+
+    def page(self, entries: list[ManifestEntry], side: str) -> list[_CardExtras]:
+        """Sprites and text of every card of one page, in layout order."""
+        result = []
+        for e in entries:
+            card = self._cards.get(e.index)
+            if card is None:
+                raise ValueError(f"PDF-drawn text and sprites need the data of card {e.index}")
+            result.append(_CardExtras(
+                self.creator.card_sprites(card, side) if self.sprites else [],
+                self.creator.card_text(card, side, self.style) if self.text else [],
+            ))
+        return result
+
+    def embed(self, c: canvas.Canvas, extras: list[_CardExtras]) -> None:
+        """Define the form XObject of every sprite on the page not yet in the document."""
+        for card in extras:
+            for sprite in card.sprites:
+                name = _sprite_form(sprite.path)
+                if not c.hasForm(name):
+                    img = load_sprite(sprite.path, scale=self._sprite_scale)
+                    with span("embed_sprite", "io", sprite=sprite.path.name):
+                        c.beginForm(name, 0, 0, 1, 1)
+                        c.drawImage(ImageReader(img), 0, 0, width=1, height=1, mask="auto")
+                        c.endForm()
+
+    def draw(
+        self,
+        c: canvas.Canvas,
+        layout: FlashCardLayout,
+        index: int,
+        back: bool,
+        extras: _CardExtras,
+        placed: tuple[int, int, int, int],
+        sx: float,
+        sy: float,
+        page_h: float,
+    ) -> None:
+        """Draw *extras* onto the card placed at *placed* (page pixels).
+
+        *sx* / *sy* are points per page pixel.
+        """
+        (ux, uy), (vx, vy), corner = _card_orientation(layout, index, back)
+        x, y, w, h = placed
+        # Card pixels at the creator's scale -> page pixels
+        k = (w if ux else h) / (TEMPLATE_SIZE[0] * self.creator.scale)
+        ox = x + corner[0] * w
+        oy = y + corner[1] * h
+        c.saveState()
+        # Card coordinates with the y axis flipped up, so glyphs stand upright
+        c.transform(k * ux * sx, -k * uy * sy, -k * vx * sx, k * vy * sy, ox * sx, page_h - oy * sy)
+        for sprite in extras.sprites:
+            c.saveState()
+            c.translate(sprite.x, -(sprite.y + sprite.h))
+            c.scale(sprite.w, sprite.h)
+            c.doForm(_sprite_form(sprite.path))
+            c.restoreState()
+        for line in extras.text:
+            c.setFillColorRGB(*(v / 255 for v in line.color))
+            c.setFont(self.font, line.size)
+            c.drawString(line.x, -line.y, line.text)
+        c.restoreState()
 
 
 # ---------------------------------------------------------------------------
 # PDF page creation
 # ---------------------------------------------------------------------------
 
+_TEMPLATE_FORM = "template_"
+
+
+def _page_template(
+    c: canvas.Canvas,
+    template_filename: str,
+    base: Image.Image,
+    page_w: float,
+    page_h: float,
+) -> str:
+    """Name of the form XObject holding the page template, defined on first use.
+
+    The template is embedded once per document; every page that uses it
+    refers to the same form instead of carrying its own copy.
+    """
+    name = f"{_TEMPLATE_FORM}{Path(template_filename).stem}"
+    if not c.hasForm(name):
+        with span("embed_template", "io", template=template_filename):
+            c.beginForm(name)
+            c.drawImage(ImageReader(base), 0, 0, width=page_w, height=page_h, mask="auto")
+            c.endForm()
+    return name
+
+
 def _create_pdf_page(
     c: canvas.Canvas,
     template_filename: str,
@@ -100,25 +361,228 @@ def _create_pdf_page(
     layout: FlashCardLayout,
     page_w: float,
     page_h: float,
+    mirror: bool = False,
+    overlay: _CardOverlay | None = None,
+    extras: list[_CardExtras] | None = None,
 ) -> None:
+    """Draw the page template on *c* with *image_set* placed on top.
+
+    Card positions come from the layout in template pixels and are mapped to
+    PDF points, so only the cards themselves are embedded per page.  With
+    *mirror* the page is flipped horizontally, which lines back pages up
+    with their fronts when printed double-sided.  With an *overlay* each
+    card's *extras* (text, sprites) are drawn over it.
+    """
     template_path = TEMPLATE_DIR / template_filename
     if not template_path.exists():
         logger.error("Template not found: %s", template_path)
         return
 
-    base = Image.open(template_path).convert("RGBA")
-
+    base = load_template(template_path, scale=layout.page_scale, copy=False)
+    form = _page_template(c, template_filename, base, page_w, page_h)
+    if overlay is not None and extras is not None:
+        overlay.embed(c, extras)
+    # Points per page pixel
+    sx = page_w / base.size[0]
+    sy = page_h / base.size[1]
+
+    c.saveState()
+    if mirror:
+        c.translate(page_w, 0)
+        c.scale(-1, 1)
+    c.doForm(form)
     for i, (_name, img_obj) in enumerate(image_set):
         processed, x, y = layout.get_layout(i, img_obj)
-        base.paste(processed, (x, y), processed)
+        w, h = processed.size
+        mask: str | None = "auto"
+        if layout.config.flatten_cards:
+            processed, mask = _flatten_card(base, processed, x, y), None
+        c.drawImage(
+            ImageReader(processed),
+            x * sx, page_h - (y + h) * sy,
+            width=w * sx, height=h * sy,
+            mask=mask,
+        )
+        if overlay is not None and extras is not None:
+            # Back pages are the mirrored ones.
+            overlay.draw(c, layout, i, mirror, extras[i], (x, y, w, h), sx, sy, page_h)
+    c.restoreState()
+
+
+def _flatten_card(page: Image.Image, card: Image.Image, x: int, y: int) -> Image.Image:
+    """Composite *card* over the *page* pixels it covers, as an opaque RGB image.
+
+    The transparent corners then show the page template (cut guides and
+    all) exactly as the PDF viewer would have blended them.
+    """
+    with span("flatten_card", "page"):
+        flat = page.crop((x, y, x + card.width, y + card.height)).convert("RGB")
+        flat.paste(card, (0, 0), card if card.has_transparency_data else None)
+    return flat
+
+
+def _draw_sheet(
+    c: canvas.Canvas,
+    layout: FlashCardLayout,
+    sheet_no: int,
+    fronts: list[str],
+    backs: list[str],
+    images: dict[str, Image.Image],
+    overlay: _CardOverlay | None = None,
+    entries: list[ManifestEntry] | None = None,
+) -> None:
+    """Draw one sheet: the front page, then its mirrored back page."""
+    with_overlay = overlay is not None and entries is not None
+
+    # Front page
+    front_imgs = [(n, images[n]) for n in fronts]
+    with span("page", "page", sheet=sheet_no + 1, side="front"):
+        extras = overlay.page(entries, "front") if with_overlay else None
+        _create_pdf_page(
+            c, layout.TEMPLATE_FRONT, front_imgs, layout, *A4,
+            overlay=overlay, extras=extras,
+        )
+        c.showPage()
+
+    # Back page (mirrored for double-sided printing)
+    back_imgs = [(n, images[n]) for n in backs]
+    with span("page", "page", sheet=sheet_no + 1, side="back"):
+        extras = overlay.page(entries, "back") if with_overlay else None
+        _create_pdf_page(
+            c, layout.TEMPLATE_BACK, back_imgs, layout, *A4,
+            mirror=True, overlay=overlay, extras=extras,
+        )
+        c.showPage()
+
+    logger.info("  Page %d generated", sheet_no + 1)
 
-    with tempfile.NamedTemporaryFile(suffix=".png", delete=False) as tmp:
-        tmp_path = Path(tmp.name)
-        base.save(tmp_path, format="PNG")
 
-    c.drawImage(str(tmp_path), 0, 0, width=page_w, height=page_h, mask="auto")
-    tmp_path.unlink(missing_ok=True)
-    base.close()
+# ---------------------------------------------------------------------------
+# Incremental rebuilds
+# ---------------------------------------------------------------------------
+
+# Bump when page compositing changes so older fingerprints never match.
+PAGE_FORMAT_VERSION = 2
+
+
+def _fingerprint_path(pdf_path: Path) -> Path:
+    return pdf_path.with_name(f"{pdf_path.name}.pages.json")
+
+
+def _page_fingerprints(
+    config: PipelineConfig,
+    style: Style,
+    size: CardSize,
+    layout: FlashCardLayout,
+    cards: list[FlashCard],
+    sheets: list[list[ManifestEntry]],
+) -> list[str]:
+    """Fingerprint every page (front, back, front, …) from the cards' inputs.
+
+    A page is identified by its layout, page template, and the content keys
+    of the cards placed on it, so no card image has to be decoded.  A card
+    listed in the manifest but missing from *cards* is keyed by the contents
+    of its image file instead, never by its file name alone.
+    """
+    creator = CardCreator(config, style, size if config.print_scale else None)
+    image_folder, _ = layout.get_paths()
+    by_index = {card.index: card for card in cards}
+    common = (
+        PAGE_FORMAT_VERSION, layout.NAME, layout.SCALE, layout.page_scale,
+        config.print_scale, config.flatten_cards,
+    )
+
+    def _page(template: str, entries: list[ManifestEntry], side: str) -> str:
+        keys = []
+        for e in entries:
+            card = by_index.get(e.index)
+            if card is not None:
+                keys.append(creator.content_key(card, side))
+            else:
+                keys.append(file_digest(image_folder / getattr(e, side)))
+        h = hashlib.sha256(repr((common, template, side, keys)).encode())
+        h.update(file_digest(TEMPLATE_DIR / template).encode())
+        return h.hexdigest()
+
+    fingerprints: list[str] = []
+    for entries in sheets:
+        fingerprints.append(_page(layout.TEMPLATE_FRONT, entries, "front"))
+        fingerprints.append(_page(layout.TEMPLATE_BACK, entries, "back"))
+    return fingerprints
+
+
+def _previous_fingerprints(pdf_path: Path) -> dict[str, int]:
+    """Map fingerprint → page index for the last build of *pdf_path*, if intact."""
+    try:
+        data = json.loads(_fingerprint_path(pdf_path).read_text())
+        if pdf_path.stat().st_size != data["pdf_size"]:
+            return {}
+    except (FileNotFoundError, ValueError, KeyError):
+        return {}
+    return {fp: i for i, fp in enumerate(data["pages"])}
+
+
+def _save_fingerprints(pdf_path: Path, fingerprints: list[str]) -> None:
+    data = {"pdf_size": pdf_path.stat().st_size, "pages": fingerprints}
+    _fingerprint_path(pdf_path).write_text(json.dumps(data))
+
+
+def _template_forms(pages: Iterable[pypdf.PageObject]) -> dict[str, IndirectObject]:
+    """References to the page-template forms used by *pages*, by form name."""
+    prefix = f"/{xObjectName('')}"
+    forms: dict[str, IndirectObject] = {}
+    for page in pages:
+        resources = page["/Resources"]
+        if "/XObject" not in resources:
+            continue
+        xobjects = resources["/XObject"]
+        for name in xobjects:
+            form = name.removeprefix(prefix)
+            if form.startswith(_TEMPLATE_FORM):
+                forms.setdefault(form, xobjects.raw_get(name))
+    return forms
+
+
+def _merge_pages(
+    pdf_path: Path,
+    old: pypdf.PdfReader,
+    fresh: io.BytesIO,
+    templates: dict[str, IndirectObject],
+    fingerprints: list[str],
+    previous: dict[str, int],
+    dirty: set[int],
+) -> None:
+    """Rebuild *pdf_path* from its clean pages plus the freshly rendered ones.
+
+    The fresh pages were drawn over empty stand-ins for the page-template
+    forms in *templates*; they are pointed at the old file's forms instead.
+    """
+    new = pypdf.PdfReader(fresh)
+    resource_names = {f"/{xObjectName(name)}": ref for name, ref in templates.items()}
+    writer = pypdf.PdfWriter()
+    next_new = 0
+    for sheet_no in range(len(fingerprints) // 2):
+        for fp in fingerprints[2 * sheet_no : 2 * sheet_no + 2]:
+            if sheet_no in dirty:
+                page = new.pages[next_new]
+                next_new += 1
+                resources = page["/Resources"]
+                if "/XObject" in resources:
+                    xobjects = resources["/XObject"]
+                    for name in xobjects.keys() & resource_names.keys():
+                        xobjects[NameObject(name)] = resource_names[name]
+                writer.add_page(page)
+            else:
+                writer.add_page(old.pages[previous[fp]])
+
+    tmp = pdf_path.with_name(f"{pdf_path.name}.tmp")
+    with open(tmp, "wb") as f:
+        writer.write(f)
+    os.replace(tmp, pdf_path)
+    logger.info(
+        "Reused %d of %d page(s) from the previous build",
+        len(fingerprints) - 2 * len(dirty), len(fingerprints),
+    )
 
 
 # ---------------------------------------------------------------------------
@@ -132,8 +596,51 @@ def create_pdf(
     cards: list[FlashCard],
     progress: ProgressCallback = None,
     cancelled: Callable[[], bool] | None = None,
+    images: dict[str, Image.Image] | None = None,
+    manifest: RunManifest | None = None,
+    on_page: PageCallback = None,
+    feed: Iterable[tuple[str, Image.Image]] | None = None,
 ) -> Path:
-    """Assemble card PNGs into a single A4 PDF. Returns path to the PDF."""
+    """Assemble card images into a single A4 PDF. Returns path to the PDF.
+
+    See :func:`iter_pdf` for how cards are found and ordered.  *on_page* is
+    called with ``(pages drawn, total)`` after each sheet.
+    """
+    pages = iter_pdf(config, style, size, cards, progress, cancelled, images, manifest, feed)
+    while True:
+        try:
+            event = next(pages)
+        except StopIteration as stop:
+            return stop.value
+        if on_page:
+            on_page(event.pages, event.total)
+
+
+def iter_pdf(
+    config: PipelineConfig,
+    style: Style,
+    size: CardSize,
+    cards: list[FlashCard],
+    progress: ProgressCallback = None,
+    cancelled: Callable[[], bool] | None = None,
+    images: dict[str, Image.Image] | None = None,
+    manifest: RunManifest | None = None,
+    feed: Iterable[tuple[str, Image.Image]] | None = None,
+) -> Generator[PageWritten, None, Path]:
+    """Assemble the PDF, yielding a :class:`PageWritten` after each sheet.
+
+    The generator returns the path of the finished PDF.
+    Cards are read from the style's ``gen_dir`` one sheet at a time, within
+    ``config.pdf_memory_bytes``, unless *images* already holds them keyed by
+    file name and run through :func:`preprocess_image`, or *feed* delivers
+    them as ``(name, image)`` pairs while they are still being rendered.  With
+    ``config.incremental_pdf`` only sheets whose fingerprint changed since the
+    previous build are recomposited; the rest are copied from the old PDF.
+
+    Which cards to print, and in what order, comes from *manifest* — or the
+    manifest Stage 2 saved next to the images, or else *cards* — never from
+    the folder's contents.
+    """
     layout = get_layout(size, config, style)
     image_folder, pdf_folder = layout.get_paths()
     pdf_folder.mkdir(parents=True, exist_ok=True)
@@ -146,83 +653,86 @@ def create_pdf(
     if progress:
         progress(f"Assembling {size.value} {layout.style_label} PDF…")
 
-    # Pre-process card images
-    images = _preprocess_images(image_folder, layout)
-    if not images:
+    in_memory = images is not None or feed is not None
+    if not in_memory and not image_folder.is_dir():
+        raise FileNotFoundError(f"Image folder not found: {image_folder}")
+    if manifest is None and not in_memory:
+        manifest = RunManifest.load(image_folder)
+    if manifest is None:
+        manifest = RunManifest.from_cards(cards, config.card_suffix)
+    entries = manifest.ordered()
+    if not entries:
         raise FileNotFoundError(f"No card images found in {image_folder}")
 
-    # Sort by difficulty
-    order = _difficulty_order(cards)
-    all_names = sorted(images.keys(), key=_natural_sort_key)
-    front_names = sorted(
-        [n for n in all_names if not n.endswith("_Back.png")],
-        key=lambda n: _sort_score(n, order),
-    )
-    back_names = [f"{n[:-4]}_Back.png" for n in front_names]
-
+    # Sheets in print order (by difficulty)
     chunk = layout.CARDS_PER_PAGE
-    temp_pdfs: list[Path] = []
-
-    try:
-        for i in range(0, len(front_names), chunk):
+    sheet_entries = [entries[i : i + chunk] for i in range(0, len(entries), chunk)]
+    sheets = [([e.front for e in s], [e.back for e in s]) for s in sheet_entries]
+
+    # Work out which pages can be reused from the previous build
+    fingerprints: list[str] = []
+    previous: dict[str, int] = {}
+    if config.incremental_pdf:
+        fingerprints = _page_fingerprints(config, style, size, layout, cards, sheet_entries)
+        previous = _previous_fingerprints(final_path)
+        if fingerprints and list(previous) == fingerprints:
+            logger.info("PDF unchanged, keeping %s", final_path)
+            return final_path
+    else:
+        _fingerprint_path(final_path).unlink(missing_ok=True)
+
+    # A sheet (front + back page) is recomposited unless both pages match
+    if previous:
+        dirty = {
+            sheet_no for sheet_no in range(len(sheets))
+            if fingerprints[2 * sheet_no] not in previous
+            or fingerprints[2 * sheet_no + 1] not in previous
+        }
+    else:
+        dirty = set(range(len(sheets)))
+    todo = sorted(dirty)
+    if images is not None:
+        pages = ((sheet_no, images) for sheet_no in todo)
+    elif feed is not None:
+        pages = _sheets_from_feed(feed, layout, sheets, todo)
+    else:
+        pages = _stream_sheets(image_folder, layout, sheets, todo, config.pdf_memory_bytes)
+
+    # With every sheet dirty there is nothing to keep; write a fresh file.
+    reuse = bool(previous) and len(todo) < len(sheets)
+    target = io.BytesIO() if reuse else str(final_path)
+    # Every front/back page is streamed into a single canvas; nothing touches
+    # the disk until the finished document is saved.
+    c = canvas.Canvas(target, pagesize=A4)
+    old: pypdf.PdfReader | None = None
+    templates: dict[str, IndirectObject] = {}
+    if reuse:
+        # Clean sheets share the dirty ones' templates (the template digest is
+        # part of every fingerprint), so the old file's forms are reused and
+        # empty stand-ins spare encoding the templates again.
+        old = pypdf.PdfReader(str(final_path))
+        templates = _template_forms(old.pages)
+        for name in templates:
+            c.beginForm(name)
+            c.endForm()
+    overlay = None
+    if config.vector_text or config.vector_sprites:
+        overlay = _CardOverlay(config, style, size, cards)
+    with closing(pages):
+        for done, (sheet_no, sheet_images) in enumerate(pages, 1):
             check_cancelled(cancelled)
-
-            fronts = [
-                (n, images[n]) for n in front_names[i : i + chunk] if n in images
-            ]
-            backs = [
-                (n, images[n]) for n in back_names[i : i + chunk] if n in images
-            ]
-            if not fronts:
-                continue
-
-            idx_s, idx_e = i + 1, i + len(fronts)
-            front_pdf = pdf_folder / f"_tmp_front_{idx_s}_{idx_e}.pdf"
-            back_pdf = pdf_folder / f"_tmp_back_{idx_s}_{idx_e}.pdf"
-
-            # Front page
-            c_front = canvas.Canvas(str(front_pdf), pagesize=A4)
-            _create_pdf_page(c_front, layout.TEMPLATE_FRONT, fronts, layout, *A4)
-            c_front.showPage()
-            c_front.save()
-            temp_pdfs.append(front_pdf)
-
-            # Back page (mirrored for double-sided printing)
-            c_back = canvas.Canvas(str(back_pdf), pagesize=A4)
-            _create_pdf_page(c_back, layout.TEMPLATE_BACK, backs, layout, *A4)
-            c_back.showPage()
-            c_back.save()
-
-            _mirror_back_pdf(back_pdf)
-            temp_pdfs.append(back_pdf)
-
-            page_num = (i // chunk) + 1
-            logger.info("  Page %d generated", page_num)
-
-        # Merge all temp PDFs
-        writer = pypdf.PdfWriter()
-        for pdf in temp_pdfs:
-            if pdf.exists():
-                reader = pypdf.PdfReader(str(pdf))
-                for page in reader.pages:
-                    writer.add_page(page)
-
-        with open(final_path, "wb") as f:
-            writer.write(f)
-
-        logger.info("PDF created: %s", final_path)
-        return final_path
-    finally:
-        for pdf in temp_pdfs:
-            pdf.unlink(missing_ok=True)
-
-
-def _mirror_back_pdf(pdf_path: Path) -> None:
-    """Mirror every page in a back-page PDF for double-sided printing."""
-    reader = pypdf.PdfReader(str(pdf_path))
-    writer = pypdf.PdfWriter()
-    for page in reader.pages:
-        _mirror_page(page)
-        writer.add_page(page)
-    with open(pdf_path, "wb") as f:
-        writer.write(f)
+            _draw_sheet(
+                c, layout, sheet_no, *sheets[sheet_no], sheet_images,
+                overlay=overlay, entries=sheet_entries[sheet_no],
+            )
+            yield PageWritten(style, size, 2 * done, 2 * len(todo))
+
+    with span("pdf_write", "io", pdf=final_path.name):
+        c.save()
+        if old is not None:
+            _merge_pages(final_path, old, target, templates, fingerprints, previous, dirty)
+    if fingerprints:
+        _save_fingerprints(final_path, fingerprints)
+
+    logger.info("PDF created: %s", final_path)
+    return final_path
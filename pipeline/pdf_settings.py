@@ -11,6 +11,12 @@ from pipeline.config import CardSize, PipelineConfig, Style
 BASE_PATH = Path(__file__).resolve().parent.parent
 TEMPLATE_DIR = BASE_PATH / "input" / "templates"
 
+# Resolution of the A4_Page_* templates; every layout coordinate below is in
+# pixels at this DPI.
+PAGE_TEMPLATE_DPI = 535
+# Low-resolution setting for quick proofing runs.
+DRAFT_DPI = 150
+
 
 # ---------------------------------------------------------------------------
 # Base class
@@ -20,6 +26,7 @@ class FlashCardLayout:
     """Base configuration for a specific card-size PDF layout."""
 
     NAME: str
+    SIZE: CardSize
     SCALE: float
     CARDS_PER_PAGE: int
     TEMPLATE_FRONT: str
@@ -28,16 +35,27 @@ class FlashCardLayout:
     def __init__(self, config: PipelineConfig, style: Style) -> None:
         self.config = config
         self.style = style
+        self.page_scale = config.dpi / PAGE_TEMPLATE_DPI if config.dpi else 1.0
 
     @property
     def style_label(self) -> str:
         return self.style.value
 
+    @property
+    def card_scale(self) -> float:
+        """Factor from full-size card pixels to page pixels at the output DPI."""
+        return self.SCALE * self.page_scale
+
     def get_paths(self) -> tuple[Path, Path]:
-        img_folder = self.config.gen_dir(self.style)
+        size = self.SIZE if self.config.print_scale else None
+        img_folder = self.config.gen_dir(self.style, size)
         pdf_folder = self.config.pdf_dir(self.style)
         return img_folder, pdf_folder
 
+    def _at_dpi(self, x: int, y: int) -> tuple[int, int]:
+        """Convert a template-DPI position to the output DPI."""
+        return round(x * self.page_scale), round(y * self.page_scale)
+
     def get_layout(self, index: int, img: Image.Image) -> tuple[Image.Image, int, int]:
         raise NotImplementedError
 
@@ -51,6 +69,7 @@ class FlashCardLayout:
 
 class LargeLayout(FlashCardLayout):
     NAME = "A4_Large"
+    SIZE = CardSize.LARGE
     SCALE = 0.5792
     CARDS_PER_PAGE = 2
     TEMPLATE_FRONT = "A4_Page_Large.png"
@@ -59,7 +78,7 @@ class LargeLayout(FlashCardLayout):
     def get_layout(self, index: int, img: Image.Image) -> tuple[Image.Image, int, int]:
         img = img.rotate(90, expand=True)
         y = 505 if index == 0 else 3516
-        return img, 627, y
+        return img, *self._at_dpi(627, y)
 
     def preprocess_back_image(self, img: Image.Image) -> Image.Image:
         return img.rotate(180, expand=True)
@@ -67,6 +86,7 @@ class LargeLayout(FlashCardLayout):
 
 class MediumLayout(FlashCardLayout):
     NAME = "A4_Medium"
+    SIZE = CardSize.MEDIUM
     SCALE = 0.5101
     CARDS_PER_PAGE = 4
     TEMPLATE_FRONT = "A4_Page_Medium.png"
@@ -77,7 +97,7 @@ class MediumLayout(FlashCardLayout):
         row = index // 2
         x = 175 if col == 0 else 2262
         y = 259 if row == 0 else 3195
-        return img, x, y
+        return img, *self._at_dpi(x, y)
 
     def preprocess_back_image(self, img: Image.Image) -> Image.Image:
         return img.transpose(Image.FLIP_TOP_BOTTOM).rotate(180)
@@ -85,6 +105,7 @@ class MediumLayout(FlashCardLayout):
 
 class SmallLayout(FlashCardLayout):
     NAME = "A4_Small"
+    SIZE = CardSize.SMALL
     SCALE = 0.4087
     CARDS_PER_PAGE = 5
     TEMPLATE_FRONT = "A4_Page_Small.png"
@@ -98,7 +119,7 @@ class SmallLayout(FlashCardLayout):
             x = 178
         else:
             x = 2668
-        return img, x, self._VERTICAL_SHIFTS[index]
+        return img, *self._at_dpi(x, self._VERTICAL_SHIFTS[index])
 
     def preprocess_back_image(self, img: Image.Image) -> Image.Image:
         return img.transpose(Image.FLIP_TOP_BOTTOM).rotate(180)
@@ -0,0 +1,188 @@
+"""Pipelined Stages 2 + 3 — draw PDF sheets while cards are still rendering."""
+
+from __future__ import annotations
+
+import contextvars
+import logging
+import queue
+from concurrent.futures import Future, ThreadPoolExecutor, wait
+from contextlib import closing
+from pathlib import Path
+from typing import Callable, Iterable, Iterator
+
+from PIL import Image
+
+from pipeline.card_creator import CardCreator
+from pipeline.config import (
+    TEMPLATE_SIZE,
+    CardSize,
+    FlashCard,
+    PipelineCancelled,
+    PipelineConfig,
+    Style,
+)
+from pipeline.events import EventCallback, PageWritten, PdfWritten
+from pipeline.manifest import RunManifest
+from pipeline.pdf_generator import create_pdf
+from pipeline.pdf_settings import FlashCardLayout, get_layout
+from pipeline.tracing import span
+
+logger = logging.getLogger(__name__)
+
+_END = object()
+_ABORT = object()
+
+
+# ---------------------------------------------------------------------------
+# Hand-off queue
+# ---------------------------------------------------------------------------
+
+class CardFeed:
+    """Bounded queue of rendered ``(name, image)`` cards for one PDF assembler.
+
+    The renderer blocks on :meth:`put` while the assembler is a full
+    ``maxsize`` cards behind, so memory stays flat however large the deck.
+    Iterating yields cards until :meth:`close`; an aborted feed raises
+    :class:`PipelineCancelled` in the assembler instead.
+    """
+
+    def __init__(self, maxsize: int) -> None:
+        self._queue: queue.Queue[object] = queue.Queue(maxsize)
+
+    def put(self, item: object, assembler: Future[Path]) -> None:
+        """Queue *item*, dropping it if *assembler* has already stopped."""
+        while not assembler.done():
+            try:
+                self._queue.put(item, timeout=0.1)
+                return
+            except queue.Full:
+                continue
+
+    def close(self, assembler: Future[Path], abort: bool = False) -> None:
+        self.put(_ABORT if abort else _END, assembler)
+
+    def __iter__(self) -> Iterator[tuple[str, Image.Image]]:
+        while (item := self._queue.get()) is not _END:
+            if item is _ABORT:
+                raise PipelineCancelled()
+            yield item  # type: ignore[misc]
+
+
+def _feed_size(config: PipelineConfig, layout: FlashCardLayout, feeds: int) -> int:
+    """Cards one of *feeds* may buffer: its share of ``config.pdf_memory_bytes``."""
+    scale = layout.card_scale if config.print_scale else 1.0
+    card_bytes = int(TEMPLATE_SIZE[0] * scale) * int(TEMPLATE_SIZE[1] * scale) * 4
+    return max(1, config.pdf_memory_bytes // (feeds * card_bytes))
+
+
+# ---------------------------------------------------------------------------
+# Render + assemble
+# ---------------------------------------------------------------------------
+
+def render_and_assemble(
+    config: PipelineConfig,
+    creator: CardCreator,
+    cards: list[FlashCard],
+    manifest: RunManifest,
+    sizes: list[CardSize],
+    created_files: list[Path],
+    on_stage: Callable[[str], None],
+    on_card_progress: Callable[[int, int, str], None] | None = None,
+    on_pdf_progress: Callable[[str], None] | None = None,
+    cancelled: Callable[[], bool] | None = None,
+    on_event: EventCallback = None,
+) -> list[tuple[Style, CardSize, Path]]:
+    """Render *cards* with *creator* while assembling its styles' PDFs for *sizes*.
+
+    Cards are rendered in print order (difficulty, then deck order) and
+    handed to one assembler thread per PDF through a :class:`CardFeed`; each
+    assembler draws a sheet as soon as its cards are in.  Rendering and
+    assembly therefore overlap, and a slow assembler throttles the renderer
+    rather than letting cards pile up.  Callbacks for PDF stages, pages and
+    written PDFs are called from the assembler threads.
+
+    Returns ``(style, size, path)`` for every PDF, in style-then-size order.
+    """
+    by_index = {card.index: card for card in cards}
+    ordered = [by_index[e.index] for e in manifest.ordered()]
+    targets = [(style, size) for style in creator.styles for size in sizes]
+    feeds = {
+        (style, size): CardFeed(_feed_size(config, get_layout(size, config, style), len(targets)))
+        for style, size in targets
+    }
+
+    def _assemble(style: Style, size: CardSize) -> Path:
+        on_stage(f"Assembling {size.value} {style.value} PDF…")
+
+        def _on_page(done: int, total: int) -> None:
+            if on_event:
+                on_event(PageWritten(style, size, done, total))
+
+        with span("create_pdf", "stage", style=style.value, size=size.value):
+            path = create_pdf(
+                config, style, size, cards,
+                progress=on_pdf_progress, cancelled=cancelled,
+                manifest=manifest, on_page=_on_page,
+                feed=feeds[style, size],
+            )
+        if on_event:
+            on_event(PdfWritten(style, size, path))
+        return path
+
+    logger.info(
+        "Rendering %d %s cards while assembling %d PDF(s)…",
+        len(ordered), creator.label, len(targets),
+    )
+    with ThreadPoolExecutor(
+        max_workers=len(targets), thread_name_prefix="pdf-assemble",
+    ) as pool:
+        assemblers = {
+            target: pool.submit(contextvars.copy_context().run, _assemble, *target)
+            for target in targets
+        }
+        try:
+            rendered = creator.iter_render(ordered, created_files, cancelled, keep_images=True)
+            size_arg = creator.size and creator.size.value
+            with closing(rendered), span(
+                "render_cards", "stage", styles=creator.label, size=size_arg,
+            ):
+                for done, (_card, images) in enumerate(rendered, 1):
+                    for style, name, img in images:
+                        # Each assembler closes the image it is fed, so every
+                        # size but the last gets a copy of its own.
+                        for size in sizes[:-1]:
+                            feeds[style, size].put((name, img.copy()), assemblers[style, size])
+                        feeds[style, sizes[-1]].put((name, img), assemblers[style, sizes[-1]])
+                    if on_card_progress:
+                        on_card_progress(done, len(ordered), creator.label)
+                    _raise_failed(assemblers.values())
+                    if not config.save_intermediates and all(
+                        f.done() for f in assemblers.values()
+                    ):
+                        break  # every PDF was unchanged; nothing left to feed
+            created_files.extend(creator.finish(cards))
+            for target, feed in feeds.items():
+                feed.close(assemblers[target])
+        except BaseException:
+            for target, feed in feeds.items():
+                feed.close(assemblers[target], abort=True)
+            wait(assemblers.values())
+            # PDFs finished before the failure are partial output too.
+            created_files.extend(
+                f.result() for f in assemblers.values() if f.exception() is None
+            )
+            raise
+
+        wait(assemblers.values())
+        created_files.extend(
+            f.result() for f in assemblers.values() if f.exception() is None
+        )
+        _raise_failed(assemblers.values())
+        return [(style, size, f.result()) for (style, size), f in assemblers.items()]
+
+
+def _raise_failed(assemblers: Iterable[Future[Path]]) -> None:
+    """Re-raise the error of an assembler that stopped early."""
+    for future in assemblers:
+        if future.done() and future.exception() is not None:
+            future.result()
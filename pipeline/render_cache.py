@@ -0,0 +1,119 @@
+"""Persistent, content-addressed cache of rendered card images."""
+
+from __future__ import annotations
+
+import dataclasses
+import hashlib
+import logging
+import os
+import shutil
+import threading
+from pathlib import Path
+
+from PIL import Image
+
+from pipeline import config as _config
+from pipeline.card_io import open_card, save_card
+from pipeline.config import FlashCard, PipelineConfig, Style
+from pipeline.tracing import span
+
+logger = logging.getLogger(__name__)
+
+# Bump whenever the compositing code changes in a way that alters pixels, so
+# entries written by older code are never served.
+RENDER_VERSION = 1
+
+# Every upper-case constant in pipeline.config (sizes, offsets, colours…).
+_LAYOUT_CONSTANTS = repr(sorted(
+    (name, repr(value))
+    for name, value in vars(_config).items()
+    if name.isupper()
+))
+
+_digest_lock = threading.Lock()
+_digests: dict[tuple[str, int, int], str] = {}
+
+
+def file_digest(path: Path) -> str:
+    """SHA-256 of a file, memoised on path, mtime and size."""
+    st = path.stat()
+    key = (str(path), st.st_mtime_ns, st.st_size)
+    with _digest_lock:
+        digest = _digests.get(key)
+    if digest is None:
+        h = hashlib.sha256()
+        with path.open("rb") as f:
+            for chunk in iter(lambda: f.read(1 << 20), b""):
+                h.update(chunk)
+        digest = h.hexdigest()
+        with _digest_lock:
+            _digests[key] = digest
+    return digest
+
+
+def card_key(
+    card: FlashCard,
+    style: Style,
+    side: str,
+    scale: float,
+    inputs: list[Path],
+) -> str:
+    """Hash everything that determines the pixels of one card side.
+
+    ``card.index`` is left out: it only names the output file, so the same
+    problem on a different position in the deck is still a cache hit.
+    *inputs* are the template, asset and font files the render reads.
+    """
+    fields = [
+        (f.name, repr(getattr(card, f.name)))
+        for f in dataclasses.fields(card)
+        if f.name != "index"
+    ]
+    h = hashlib.sha256()
+    h.update(repr((RENDER_VERSION, fields, style.value, side, scale)).encode())
+    h.update(_LAYOUT_CONSTANTS.encode())
+    for path in inputs:
+        h.update(file_digest(path).encode())
+    return h.hexdigest()
+
+
+class RenderCache:
+    """Directory of rendered card images named by their :func:`card_key`.
+
+    Writes are atomic, so several processes may share one directory.  The
+    cache never evicts; deleting the directory is always safe.
+    """
+
+    def __init__(self, root: Path, config: PipelineConfig) -> None:
+        self.root = root
+        self.root.mkdir(parents=True, exist_ok=True)
+        # Entries are stored in the run's card format, so hits copy straight
+        # into gen_dir; each format has its own entries.
+        self.config = config
+        self.suffix = config.card_suffix
+
+    def _path(self, key: str) -> Path:
+        return self.root / key[:2] / f"{key}{self.suffix}"
+
+    def get(self, key: str) -> Image.Image | None:
+        path = self._path(key)
+        try:
+            return open_card(path)
+        except (FileNotFoundError, OSError, ValueError):
+            return None
+
+    def copy_to(self, key: str, dest: Path) -> bool:
+        """Copy a cached image straight to *dest*; returns False on a miss."""
+        try:
+            shutil.copyfile(self._path(key), dest)
+        except FileNotFoundError:
+            return False
+        return True
+
+    def put(self, key: str, img: Image.Image) -> None:
+        path = self._path(key)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        tmp = path.with_name(f"{path.name}.{os.getpid()}.{threading.get_ident()}.tmp")
+        with span("card_encode", "io", target="render_cache"):
+            save_card(img, tmp, self.config)
+        os.replace(tmp, path)
@@ -0,0 +1,362 @@
+"""Process-wide cache of decoded templates, fonts and pre-scaled sprites."""
+
+from __future__ import annotations
+
+import json
+import logging
+import mmap
+import struct
+import threading
+from collections import OrderedDict
+from pathlib import Path
+from typing import Any, Callable, Hashable, TypeVar
+
+from PIL import Image, ImageFont
+
+from pipeline.tracing import span
+
+logger = logging.getLogger(__name__)
+
+T = TypeVar("T")
+
+DEFAULT_CACHE_BYTES = 1 << 30
+
+# Pre-decoded templates, written next to them by pipeline.template_bundle.
+TEMPLATE_BUNDLE = "templates.bundle"
+# Compiled asset packs (pipeline.asset_pack) sit beside the pack folder.
+PACK_SUFFIX = ".pack"
+BUNDLE_MAGIC = b"FCTPLB01"
+# Pixel data is page aligned (for page sizes up to 64 KiB) so processes
+# mapping the bundle share pages.
+BUNDLE_ALIGN = 1 << 16
+
+
+def image_nbytes(img: Image.Image) -> int:
+    """Approximate in-memory size of a decoded image."""
+    return img.width * img.height * len(img.getbands())
+
+
+def _mapped_nbytes(img: Image.Image) -> int:
+    # Bundle views live in the OS page cache, not in this process's budget.
+    return 0 if img.readonly else image_nbytes(img)
+
+
+# ---------------------------------------------------------------------------
+# LRU cache
+# ---------------------------------------------------------------------------
+
+class ResourceCache:
+    """Thread-safe LRU cache bounded by an approximate byte budget.
+
+    Values are produced by a *loader* on a miss.  Two threads missing the
+    same key at once may both load it; the second insert simply wins.
+    Entries larger than the whole budget are returned but never stored.
+    """
+
+    def __init__(self, max_bytes: int = DEFAULT_CACHE_BYTES) -> None:
+        self._max_bytes = max_bytes
+        self._entries: OrderedDict[Hashable, tuple[Any, int]] = OrderedDict()
+        self._bytes = 0
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    @property
+    def max_bytes(self) -> int:
+        return self._max_bytes
+
+    @property
+    def bytes_used(self) -> int:
+        return self._bytes
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def get(
+        self,
+        key: Hashable,
+        loader: Callable[[], T],
+        size_of: Callable[[T], int],
+    ) -> T:
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return entry[0]
+            self.misses += 1
+
+        value = loader()
+        nbytes = size_of(value)
+        if nbytes > self._max_bytes:
+            return value
+
+        with self._lock:
+            old = self._entries.pop(key, None)
+            if old is not None:
+                self._bytes -= old[1]
+            self._entries[key] = (value, nbytes)
+            self._bytes += nbytes
+            self._evict()
+        return value
+
+    def resize(self, max_bytes: int) -> None:
+        """Change the byte budget, evicting least-recently-used entries if needed."""
+        with self._lock:
+            self._max_bytes = max_bytes
+            self._evict()
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+            self._bytes = 0
+
+    def _evict(self) -> None:
+        while self._bytes > self._max_bytes and self._entries:
+            key, (_value, nbytes) = self._entries.popitem(last=False)
+            self._bytes -= nbytes
+            logger.debug("Evicted %s from resource cache", key)
+
+
+_shared = ResourceCache()
+
+
+def shared_cache() -> ResourceCache:
+    """Return the cache shared by every pipeline run in this process."""
+    return _shared
+
+
+# ---------------------------------------------------------------------------
+# Typed loaders
+# ---------------------------------------------------------------------------
+
+def _file_key(path: Path) -> tuple[str, int, int]:
+    """Identify a file by path, mtime and size so edits on disk invalidate it."""
+    st = path.stat()
+    return str(path), st.st_mtime_ns, st.st_size
+
+
+def decode_template(path: Path, scale: float = 1.0) -> Image.Image:
+    """Decode the template at *path* to RGBA, rescaled by *scale*."""
+    img = Image.open(path).convert("RGBA")
+    if scale == 1.0:
+        return img
+    size = (int(img.size[0] * scale), int(img.size[1] * scale))
+    return img.resize(size, Image.Resampling.LANCZOS)
+
+
+def load_template(path: Path, scale: float = 1.0, copy: bool = True) -> Image.Image:
+    """Return a private RGBA copy of the template at *path*, optionally rescaled.
+
+    The decoded template stays cached; callers are free to draw on the copy.
+    With ``copy=False`` the shared image is returned and must not be modified.
+    Templates compiled into a bundle are mapped from it instead of decoded.
+    """
+
+    def _load() -> Image.Image:
+        bundle = open_bundle(path.parent / TEMPLATE_BUNDLE)
+        img = bundle.get(path, scale) if bundle is not None else None
+        if img is not None:
+            return img
+        with span("load_template", "resource", path=path.name, scale=scale):
+            return decode_template(path, scale)
+
+    img = _shared.get(
+        ("template", *_file_key(path), scale),
+        _load,
+        _mapped_nbytes,
+    )
+    return img.copy() if copy else img
+
+
+def load_trimmed_template(path: Path, scale: float = 1.0) -> tuple[Image.Image, tuple[int, int]]:
+    """Return the shared template at *path* cropped to its alpha bounding box, and the offset.
+
+    For overlays that are transparent almost everywhere, such as the Plus /
+    Minus symbols, pasting the crop blends a small fraction of the canvas.
+    """
+    return _shared.get(
+        ("trimmed_template", *_file_key(path), scale),
+        lambda: _alpha_crop(load_template(path, scale, copy=False), path, scale),
+        lambda trimmed: _mapped_nbytes(trimmed[0]),
+    )
+
+
+def load_font(path: Path, size: int) -> ImageFont.FreeTypeFont:
+    """Return the TrueType font at *path* in the given point *size*."""
+    file_key = _file_key(path)
+    return _shared.get(
+        ("font", *file_key, size),
+        lambda: ImageFont.truetype(str(path), size=size),
+        lambda _font: file_key[2],
+    )
+
+
+def load_sprite(
+    path: Path,
+    size: tuple[int, int] | None = None,
+    scale: float | None = None,
+) -> Image.Image:
+    """Return the asset at *path* resized to *size*, or by a *scale* factor.
+
+    Sprites are shared between callers and must be treated as read-only.
+    Sizes compiled into the pack's bundle are mapped from it instead.
+    """
+
+    def _load() -> Image.Image:
+        variant = size or scale
+        if variant is not None:
+            bundle = open_bundle(pack_bundle_path(path.parent))
+            img = bundle.get(path, variant) if bundle is not None else None
+            if img is not None:
+                return img
+        with span("load_sprite", "resource", path=path.name, size=size, scale=scale):
+            return decode_sprite(path, size, scale)
+
+    return _shared.get(
+        ("sprite", *_file_key(path), size, scale),
+        _load,
+        _mapped_nbytes,
+    )
+
+
+def load_trimmed_sprite(
+    path: Path,
+    size: tuple[int, int] | None = None,
+    scale: float | None = None,
+) -> tuple[Image.Image, tuple[int, int]]:
+    """Return :func:`load_sprite` cropped to its alpha bounding box, and the crop's offset.
+
+    Pasting the crop (masked by itself) at the offset yields the same pixels
+    as pasting the whole sprite, without blending its transparent margins.
+    """
+
+    return _shared.get(
+        ("trimmed_sprite", *_file_key(path), size, scale),
+        lambda: _alpha_crop(load_sprite(path, size, scale), path, size or scale),
+        lambda trimmed: _mapped_nbytes(trimmed[0]),
+    )
+
+
+def _alpha_crop(
+    img: Image.Image,
+    path: Path,
+    variant: object,
+) -> tuple[Image.Image, tuple[int, int]]:
+    """Crop *img* to its alpha bounding box; pasting the crop (masked by
+    itself) at the returned offset gives the same pixels as pasting *img*."""
+    bbox = img.getchannel("A").getbbox() if "A" in img.getbands() else None
+    if bbox is None or bbox == (0, 0, *img.size):
+        return img, (0, 0)
+    with span("trim", "resource", path=path.name, variant=variant):
+        return img.crop(bbox), bbox[:2]
+
+
+def decode_sprite(
+    path: Path,
+    size: tuple[int, int] | None = None,
+    scale: float | None = None,
+) -> Image.Image:
+    """Decode the asset at *path*, resized to *size* or by a *scale* factor."""
+    img = Image.open(path)
+    target = size
+    if target is None and scale is not None:
+        target = (int(img.size[0] * scale), int(img.size[1] * scale))
+    if target is None:
+        img.load()
+        return img
+    return img.resize(target)
+
+
+# ---------------------------------------------------------------------------
+# Pixel bundles
+# ---------------------------------------------------------------------------
+
+# Modes stored as raw pixels; anything else is left out of bundles.
+BUNDLE_MODES = {"L": 1, "LA": 2, "RGB": 3, "RGBA": 4}
+
+
+def bundle_data_offset(index_len: int) -> int:
+    """File offset of a bundle's pixel data, given the length of its index."""
+    end = len(BUNDLE_MAGIC) + 8 + index_len
+    return -(-end // BUNDLE_ALIGN) * BUNDLE_ALIGN
+
+
+def pack_bundle_path(assets_dir: Path) -> Path:
+    """Where the compiled bundle of the asset pack in *assets_dir* lives."""
+    return assets_dir.parent / f"{assets_dir.name}{PACK_SUFFIX}"
+
+
+def _variant(value: Any) -> Hashable:
+    # JSON turns (w, h) sizes into lists.
+    return tuple(value) if isinstance(value, list) else value
+
+
+class PixelBundle:
+    """Read-only view of a bundle of pre-decoded images.
+
+    The file is an 8-byte magic, the little-endian length of a JSON index,
+    the index, then each image's raw pixels; pixel data starts at the next
+    :data:`BUNDLE_ALIGN` boundary, and entry offsets are relative to it.
+    Images are served straight from the mapping, so every process that maps
+    a bundle shares one copy of the pixels through the page cache.
+
+    Each image is the *variant* (a template scale, a sprite size…) of a
+    source file in the bundle's folder, identified by file name.
+    """
+
+    def __init__(self, path: Path) -> None:
+        with open(path, "rb") as f:
+            self._map = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        if self._map[: len(BUNDLE_MAGIC)] != BUNDLE_MAGIC:
+            raise ValueError(f"Not a pixel bundle: {path}")
+        (index_len,) = struct.unpack_from("<Q", self._map, len(BUNDLE_MAGIC))
+        start = len(BUNDLE_MAGIC) + 8
+        self.index: dict[str, Any] = json.loads(self._map[start : start + index_len])
+        self._data = bundle_data_offset(index_len)
+        self._entries = {
+            (e["name"], _variant(e["variant"])): e for e in self.index["images"]
+        }
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def get(self, path: Path, variant: Hashable) -> Image.Image | None:
+        """Return the bundled *variant* of the file at *path*, or None.
+
+        Entries whose source file has changed since compiling are ignored.
+        """
+        entry = self._entries.get((path.name, variant))
+        if entry is None:
+            return None
+        st = path.stat()
+        if (st.st_mtime_ns, st.st_size) != (entry["mtime_ns"], entry["size"]):
+            return None
+        mode, w, h = entry["mode"], entry["width"], entry["height"]
+        offset = self._data + entry["offset"]
+        data = memoryview(self._map)[offset : offset + w * h * BUNDLE_MODES[mode]]
+        return Image.frombuffer(mode, (w, h), data, "raw", mode, 0, 1)
+
+
+_bundles: dict[Path, tuple[tuple[int, int, int], PixelBundle | None]] = {}
+_bundles_lock = threading.Lock()
+
+
+def open_bundle(path: Path) -> PixelBundle | None:
+    """Return the bundle at *path* (None if absent), reopened when rewritten."""
+    try:
+        st = path.stat()
+    except FileNotFoundError:
+        return None
+    key = (st.st_ino, st.st_mtime_ns, st.st_size)
+    with _bundles_lock:
+        cached = _bundles.get(path)
+        if cached is not None and cached[0] == key:
+            return cached[1]
+        try:
+            bundle: PixelBundle | None = PixelBundle(path)
+        except (OSError, ValueError, KeyError, struct.error) as exc:
+            logger.warning("Ignoring bundle %s: %s", path, exc)
+            bundle = None
+        _bundles[path] = (key, bundle)
+        return bundle
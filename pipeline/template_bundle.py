@@ -0,0 +1,138 @@
+"""Compile the templates a config uses into memory-mappable bundles.
+
+Decoding a full-size template PNG takes a few hundred milliseconds, and
+every process used to pay it for every template it touched.  A compiled
+bundle holds the decoded (and, where needed, pre-scaled) RGBA pixels, which
+:func:`pipeline.resources.load_template` maps instead of decoding.
+"""
+
+from __future__ import annotations
+
+import json
+import logging
+import os
+import struct
+from collections import defaultdict
+from dataclasses import dataclass
+from functools import partial
+from pathlib import Path
+from typing import Any, Callable
+
+from PIL import Image
+
+from pipeline.card_creator import template_paths
+from pipeline.config import PipelineConfig, Style
+from pipeline.pdf_settings import TEMPLATE_DIR, get_layout
+from pipeline.resources import (
+    BUNDLE_ALIGN,
+    BUNDLE_MAGIC,
+    BUNDLE_MODES,
+    TEMPLATE_BUNDLE,
+    bundle_data_offset,
+    decode_template,
+)
+from pipeline.tracing import span
+
+logger = logging.getLogger(__name__)
+
+
+def template_scales(config: PipelineConfig) -> dict[Path, set[float]]:
+    """Return every template a run with *config* loads, and at which scales."""
+    wanted: dict[Path, set[float]] = defaultdict(set)
+    layouts = [get_layout(size, config, Style.STANDARD) for size in config.sizes]
+    card_scales = {layout.card_scale for layout in layouts} if config.print_scale else {1.0}
+    for kind in template_paths(config.template_dir).values():
+        for path in kind.values():
+            wanted[path] |= card_scales
+    for layout in layouts:
+        for name in (layout.TEMPLATE_FRONT, layout.TEMPLATE_BACK):
+            wanted[TEMPLATE_DIR / name].add(layout.page_scale)
+    return wanted
+
+
+def compile_templates(config: PipelineConfig) -> list[Path]:
+    """Write a bundle into each template folder *config* reads from.
+
+    A bundle replaces the previous one in its folder, so it holds the
+    templates of the last config compiled; anything else is still decoded
+    from its PNG.  Returns the bundle paths.
+    """
+    by_folder: dict[Path, list[BundleImage]] = defaultdict(list)
+    for path, scales in sorted(template_scales(config).items()):
+        with Image.open(path) as img:
+            w, h = img.size
+        for scale in sorted(scales):
+            size = (w, h) if scale == 1.0 else (int(w * scale), int(h * scale))
+            by_folder[path.parent].append(BundleImage(
+                path, scale, "RGBA", size,
+                partial(decode_template, path, scale),
+            ))
+    return [
+        write_bundle(folder / TEMPLATE_BUNDLE, images)
+        for folder, images in by_folder.items()
+    ]
+
+
+# ---------------------------------------------------------------------------
+# Bundle writer
+# ---------------------------------------------------------------------------
+
+@dataclass
+class BundleImage:
+    """One image to store: the *variant* of *source* that *decode* produces."""
+    source: Path
+    variant: float | tuple[int, int]
+    mode: str
+    size: tuple[int, int]
+    decode: Callable[[], Image.Image]
+
+
+def write_bundle(
+    bundle: Path,
+    images: list[BundleImage],
+    index: dict[str, Any] | None = None,
+) -> Path:
+    """Write *images* (decoded one at a time) and *index* to *bundle*.
+
+    See :class:`pipeline.resources.PixelBundle` for the layout.  Images in a
+    mode the bundle cannot hold raw are left out.
+    """
+    entries = []
+    offset = 0
+    stored = []
+    for image in images:
+        if image.mode not in BUNDLE_MODES:
+            logger.debug("Not bundling %s (mode %s)", image.source.name, image.mode)
+            continue
+        st = image.source.stat()
+        w, h = image.size
+        entries.append({
+            "name": image.source.name, "variant": image.variant, "mode": image.mode,
+            "mtime_ns": st.st_mtime_ns, "size": st.st_size,
+            "width": w, "height": h, "offset": offset,
+        })
+        stored.append(image)
+        offset += -(-w * h * BUNDLE_MODES[image.mode] // BUNDLE_ALIGN) * BUNDLE_ALIGN
+
+    header = json.dumps({**(index or {}), "images": entries}).encode()
+    data = bundle_data_offset(len(header))
+    tmp = bundle.with_name(bundle.name + ".tmp")
+    with open(tmp, "wb") as f:
+        f.write(BUNDLE_MAGIC + struct.pack("<Q", len(header)) + header)
+        for entry, image in zip(entries, stored):
+            with span("bundle_image", "resource", path=entry["name"], variant=entry["variant"]):
+                img = image.decode()
+            if img.mode != image.mode or img.size != image.size:
+                raise ValueError(
+                    f"{image.source.name} decoded as {img.mode} {img.size}, "
+                    f"expected {image.mode} {image.size}"
+                )
+            f.seek(data + entry["offset"])
+            f.write(img.tobytes())
+        f.truncate(data + offset)
+    # Replacing (not rewriting) the file leaves running processes' mappings intact.
+    os.replace(tmp, bundle)
+    logger.info(
+        "Wrote %d image(s) to %s (%.0f MB)", len(entries), bundle, (data + offset) / 1e6,
+    )
+    return bundle
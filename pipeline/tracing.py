@@ -0,0 +1,164 @@
+"""Optional timed spans for pipeline runs, exportable as JSON or Chrome traces."""
+
+from __future__ import annotations
+
+import json
+import logging
+import os
+import threading
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+from dataclasses import asdict, dataclass, field
+from pathlib import Path
+from typing import Any, Iterator
+
+logger = logging.getLogger(__name__)
+
+
+# ---------------------------------------------------------------------------
+# Spans
+# ---------------------------------------------------------------------------
+
+@dataclass
+class Span:
+    """One timed region. Times are absolute ``perf_counter_ns`` values."""
+    name: str
+    category: str
+    start_ns: int
+    duration_ns: int
+    pid: int
+    tid: int
+    args: dict[str, Any] = field(default_factory=dict)
+
+
+class Tracer:
+    """Collects :class:`Span` records from every thread of a run.
+
+    Pass one to ``run_pipeline(tracer=…)``; when none is active, :func:`span`
+    costs a single context-variable lookup.  Spans recorded in worker
+    processes are shipped back and merged with :meth:`extend`.
+    """
+
+    def __init__(self) -> None:
+        self.origin_ns = time.perf_counter_ns()
+        self._spans: list[Span] = []
+        self._lock = threading.Lock()
+
+    @property
+    def spans(self) -> list[Span]:
+        with self._lock:
+            return list(self._spans)
+
+    def add(self, span: Span) -> None:
+        with self._lock:
+            self._spans.append(span)
+
+    def extend(self, spans: list[Span]) -> None:
+        with self._lock:
+            self._spans.extend(spans)
+
+    def drain(self) -> list[Span]:
+        """Remove and return every span recorded so far."""
+        with self._lock:
+            spans, self._spans = self._spans, []
+        return spans
+
+    @contextmanager
+    def span(self, name: str, category: str, **args: Any) -> Iterator[None]:
+        start = time.perf_counter_ns()
+        try:
+            yield
+        finally:
+            self.add(Span(
+                name, category, start, time.perf_counter_ns() - start,
+                os.getpid(), threading.get_native_id(), args,
+            ))
+
+    # -- Export ------------------------------------------------------------
+
+    def to_json(self) -> dict[str, Any]:
+        """Spans as plain dicts, with times in microseconds since the tracer started."""
+        spans = []
+        for s in sorted(self.spans, key=lambda s: s.start_ns):
+            d = asdict(s)
+            d["start_us"] = (d.pop("start_ns") - self.origin_ns) / 1000
+            d["duration_us"] = d.pop("duration_ns") / 1000
+            spans.append(d)
+        return {"spans": spans}
+
+    def to_chrome_trace(self) -> dict[str, Any]:
+        """Spans as Chrome trace events (load in chrome://tracing or Perfetto)."""
+        events = [
+            {
+                "name": s.name,
+                "cat": s.category,
+                "ph": "X",
+                "ts": (s.start_ns - self.origin_ns) / 1000,
+                "dur": s.duration_ns / 1000,
+                "pid": s.pid,
+                "tid": s.tid,
+                "args": {k: _jsonable(v) for k, v in s.args.items()},
+            }
+            for s in self.spans
+        ]
+        return {"traceEvents": events, "displayTimeUnit": "ms"}
+
+    def save_json(self, path: Path) -> None:
+        path.write_text(json.dumps(self.to_json(), default=str, indent=1))
+        logger.info("Trace written to %s", path)
+
+    def save_chrome_trace(self, path: Path) -> None:
+        path.write_text(json.dumps(self.to_chrome_trace()))
+        logger.info("Chrome trace written to %s", path)
+
+
+def _jsonable(value: Any) -> Any:
+    if isinstance(value, (str, int, float, bool)) or value is None:
+        return value
+    return str(value)
+
+
+# ---------------------------------------------------------------------------
+# Active tracer
+# ---------------------------------------------------------------------------
+
+_active: ContextVar[Tracer | None] = ContextVar("pipeline_tracer", default=None)
+
+
+class _NoSpan:
+    def __enter__(self) -> None:
+        return None
+
+    def __exit__(self, *exc: object) -> None:
+        return None
+
+
+_NO_SPAN = _NoSpan()
+
+
+def current_tracer() -> Tracer | None:
+    return _active.get()
+
+
+def span(name: str, category: str, **args: Any):
+    """Time a ``with`` block on the active tracer; a no-op when tracing is off."""
+    tracer = _active.get()
+    if tracer is None:
+        return _NO_SPAN
+    return tracer.span(name, category, **args)
+
+
+@contextmanager
+def activate(tracer: Tracer | None) -> Iterator[Tracer | None]:
+    """Make *tracer* the active tracer for the current context."""
+    token = _active.set(tracer)
+    try:
+        yield tracer
+    finally:
+        _active.reset(token)
+
+
+def install(tracer: Tracer | None) -> None:
+    """Make *tracer* active for the rest of this context (used by pool workers)."""
+    _active.set(tracer)